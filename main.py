@@ -1,26 +1,48 @@
 """Command-line interface for rice price scraper."""
 import argparse
+import copy
+import os
 import yaml
 import logging
 from pathlib import Path
+from typing import Dict
 from src.logger import setup_logging
 from src.scraper import RicePriceScraper
 from src.exporter import DataExporter
 
 
+# Prefer libyaml's C loader when available
+_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed configs keyed by (absolute path, mtime, size)
+_CONFIG_CACHE: Dict[tuple, dict] = {}
+
+
 def load_config(config_path: str) -> dict:
     """
     Load configuration from YAML file.
     
+    Parsed configs are cached per file and invalidated when the file's
+    mtime or size changes. Callers always receive their own copy.
+    
     Args:
         config_path: Path to config file
         
     Returns:
         Configuration dictionary
     """
+    st = os.stat(config_path)
+    key = (os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+    
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
     with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    return config
+        config = yaml.load(f, Loader=_LOADER)
+    
+    _CONFIG_CACHE[key] = config
+    return copy.deepcopy(config)
 
 
 def main():
@@ -70,6 +92,12 @@ def main():
         help='Export only to Excel'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the development HTML cache'
+    )
+    
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -96,6 +124,10 @@ def main():
         config['output']['csv_enabled'] = False
         config['output']['excel_enabled'] = True
     
+    # Bypass cached pages
+    if args.no_cache:
+        config.setdefault('html_cache', {})['enabled'] = False
+    
     # Override log level if verbose
     if args.verbose:
         config['logging']['level'] = 'DEBUG'
@@ -125,7 +157,9 @@ def main():
         
         # Export combined results
         if all_products:
-            exporter.export_combined(all_products, args.output)
+            # Reuse the records serialized during per-slice export, if any;
+            # otherwise the exporter builds rows from the products directly
+            exporter.export_combined(all_products, args.output, records=scraper.records)
             logger.info(f"Successfully scraped {len(all_products)} products")
         else:
             logger.warning("No products were scraped")
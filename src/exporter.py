@@ -2,14 +2,32 @@
 import os
 import csv
 import logging
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from src.models import Product
-
+from src.models import Product, FIELDS
 
 logger = logging.getLogger(__name__)
 
+# Fixed column order for exported files, matching Product.to_dict()
+COLUMNS = list(FIELDS)
+
+
+def _column_letter(idx: int) -> str:
+    """Convert a 0-based column index to its Excel letter."""
+    result = ""
+    idx += 1  # Excel columns are 1-indexed
+    while idx > 0:
+        idx -= 1
+        result = chr(65 + (idx % 26)) + result
+        idx //= 26
+    return result
+
+
+# Letters for columns A..ZZ
+_COL_LETTERS = tuple(_column_letter(i) for i in range(702))
+
 
 class DataExporter:
     """Export scraped data to CSV and Excel formats."""
@@ -23,6 +41,13 @@ class DataExporter:
         """
         self.config = output_config
         self.output_dir = output_config.get('output_dir', 'output')
+        self.excel_engine = output_config.get('excel_engine', 'xlsxwriter')
+        self.csv_enabled = output_config.get('csv_enabled', True)
+        self.excel_enabled = output_config.get('excel_enabled', True)
+        self.filename_format = output_config.get(
+            'filename_format',
+            'rice_prices_{date}_{retailer}_{country}.{ext}'
+        )
         self._ensure_output_dir()
     
     def _ensure_output_dir(self):
@@ -30,7 +55,8 @@ class DataExporter:
         os.makedirs(self.output_dir, exist_ok=True)
         logger.info(f"Output directory: {self.output_dir}")
     
-    def export(self, products: List[Product], retailer: str, country: str):
+    def export(self, products: List[Product], retailer: str, country: str,
+               records: Optional[List[dict]] = None):
         """
         Export products to configured formats.
         
@@ -38,26 +64,81 @@ class DataExporter:
             products: List of Product objects
             retailer: Retailer name
             country: Country code
+            records: Optional precomputed product dictionaries
         """
-        if not products:
+        if not products and not records:
             logger.warning(f"No products to export for {retailer} {country}")
             return
         
-        # Convert to list of dictionaries
-        data = [p.to_dict() for p in products]
-        df = pd.DataFrame(data)
+        # One timestamp for the batch so paired CSV/XLSX names match
+        date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        if not self.excel_enabled:
+            # CSV only: stream rows without building a DataFrame
+            if self.csv_enabled:
+                filename = self._generate_filename(retailer, country, 'csv', date_str)
+                csv_path = self._stream_csv(
+                    products, records, os.path.join(self.output_dir, filename)
+                )
+                logger.info(f"Exported to CSV: {csv_path}")
+            return
+        
+        df = self._to_dataframe(products, records)
         
         # Export to CSV
-        if self.config.get('csv_enabled', True):
-            csv_path = self._export_csv(df, retailer, country)
+        if self.csv_enabled:
+            csv_path = self._export_csv(df, retailer, country, date_str)
             logger.info(f"Exported to CSV: {csv_path}")
         
         # Export to Excel
-        if self.config.get('excel_enabled', True):
-            excel_path = self._export_excel(df, retailer, country)
+        if self.excel_enabled:
+            excel_path = self._export_excel(df, retailer, country, date_str)
             logger.info(f"Exported to Excel: {excel_path}")
     
-    def _export_csv(self, df: pd.DataFrame, retailer: str, country: str) -> str:
+    def _to_dataframe(self, products: Optional[List[Product]],
+                      records: Optional[List[dict]] = None) -> pd.DataFrame:
+        """
+        Build a DataFrame with the fixed export column order.
+        
+        Args:
+            products: List of Product objects (used when records is None)
+            records: Optional precomputed product dictionaries
+            
+        Returns:
+            Pandas DataFrame
+        """
+        if not records:
+            # Tuples skip per-row dict construction
+            records = [p.to_record_tuple() for p in products]
+        return pd.DataFrame.from_records(records, columns=COLUMNS)
+    
+    def _stream_csv(self, products: Optional[List[Product]],
+                    records: Optional[List[dict]], filepath: str) -> str:
+        """
+        Write products to CSV row by row with the stdlib csv module.
+        
+        Args:
+            products: List of Product objects (used when records is None)
+            records: Optional precomputed product dictionaries
+            filepath: Destination CSV path
+            
+        Returns:
+            Path to CSV file
+        """
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            if records:
+                writer = csv.DictWriter(f, fieldnames=COLUMNS, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(COLUMNS)
+                writer.writerows(p.to_record_tuple() for p in products)
+        
+        return filepath
+    
+    def _export_csv(self, df: pd.DataFrame, retailer: str, country: str,
+                   date_str: Optional[str] = None) -> str:
         """
         Export data to CSV.
         
@@ -65,17 +146,19 @@ class DataExporter:
             df: Pandas DataFrame
             retailer: Retailer name
             country: Country code
+            date_str: Optional precomputed filename timestamp
             
         Returns:
             Path to CSV file
         """
-        filename = self._generate_filename(retailer, country, 'csv')
+        filename = self._generate_filename(retailer, country, 'csv', date_str)
         filepath = os.path.join(self.output_dir, filename)
         
         df.to_csv(filepath, index=False, encoding='utf-8')
         return filepath
     
-    def _export_excel(self, df: pd.DataFrame, retailer: str, country: str) -> str:
+    def _export_excel(self, df: pd.DataFrame, retailer: str, country: str,
+                    date_str: Optional[str] = None) -> str:
         """
         Export data to Excel with formatting.
         
@@ -83,35 +166,54 @@ class DataExporter:
             df: Pandas DataFrame
             retailer: Retailer name
             country: Country code
+            date_str: Optional precomputed filename timestamp
             
         Returns:
             Path to Excel file
         """
-        filename = self._generate_filename(retailer, country, 'xlsx')
+        filename = self._generate_filename(retailer, country, 'xlsx', date_str)
         filepath = os.path.join(self.output_dir, filename)
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        with pd.ExcelWriter(filepath, engine=self.excel_engine) as writer:
             df.to_excel(writer, sheet_name='Rice Prices', index=False)
             
             # Auto-adjust column widths
             worksheet = writer.sheets['Rice Prices']
             for idx, col in enumerate(df.columns):
                 try:
-                    # Get max length of column values
-                    col_values = df[col].fillna('').astype(str)
-                    max_length = max(
-                        col_values.str.len().max(),
-                        len(col)
-                    )
-                    # Calculate column letter (A, B, C, ..., Z, AA, AB, etc.)
-                    col_letter = self._get_column_letter(idx)
-                    worksheet.column_dimensions[col_letter].width = min(max_length + 2, 50)
+                    max_length = max(self._get_max_length(df[col]), len(col))
+                    width = min(max_length + 2, 50)
+                    if self.excel_engine == 'xlsxwriter':
+                        # xlsxwriter takes zero-based column indices directly
+                        worksheet.set_column(idx, idx, width)
+                    else:
+                        # Calculate column letter (A, B, C, ..., Z, AA, AB, etc.)
+                        col_letter = self._get_column_letter(idx)
+                        worksheet.column_dimensions[col_letter].width = width
                 except Exception as e:
                     logger.warning(f"Could not auto-size column {col}: {e}")
         
         return filepath
     
-    def _generate_filename(self, retailer: str, country: str, extension: str) -> str:
+    def _get_max_length(self, column: pd.Series) -> int:
+        """
+        Compute the longest string representation in a column.
+        
+        Args:
+            column: Pandas Series
+            
+        Returns:
+            Maximum value length, 0 for an empty column
+        """
+        if column.empty:
+            return 0
+        
+        values = column.to_numpy(dtype=object)
+        values = np.where(pd.isna(values), '', values).astype(str)
+        return int(np.char.str_len(values).max())
+    
+    def _generate_filename(self, retailer: str, country: str, extension: str,
+                           date_str: Optional[str] = None) -> str:
         """
         Generate filename based on configuration.
         
@@ -119,17 +221,15 @@ class DataExporter:
             retailer: Retailer name
             country: Country code
             extension: File extension
+            date_str: Optional precomputed timestamp shared by a batch
             
         Returns:
             Filename string
         """
-        date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename_format = self.config.get(
-            'filename_format',
-            'rice_prices_{date}_{retailer}_{country}.{ext}'
-        )
+        if date_str is None:
+            date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        return filename_format.format(
+        return self.filename_format.format(
             date=date_str,
             retailer=retailer.lower(),
             country=country.lower(),
@@ -146,56 +246,60 @@ class DataExporter:
         Returns:
             Column letter string
         """
-        result = ""
-        idx += 1  # Excel columns are 1-indexed
-        while idx > 0:
-            idx -= 1
-            result = chr(65 + (idx % 26)) + result
-            idx //= 26
-        return result
+        if idx < len(_COL_LETTERS):
+            return _COL_LETTERS[idx]
+        return _column_letter(idx)
     
-    def export_combined(self, all_products: List[Product], filename: str = None):
+    def export_combined(self, all_products: List[Product] = None, filename: str = None,
+                        records: Optional[List[dict]] = None):
         """
         Export all products to a single combined file.
         
         Args:
             all_products: List of all Product objects
             filename: Optional custom filename
+            records: Optional precomputed product dictionaries
         """
-        if not all_products:
+        if not all_products and not records:
             logger.warning("No products to export")
             return
         
-        data = [p.to_dict() for p in all_products]
-        df = pd.DataFrame(data)
-        
         if filename is None:
             date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f'rice_prices_combined_{date_str}'
         
+        if not self.excel_enabled:
+            # CSV only: stream rows without building a DataFrame
+            if self.csv_enabled:
+                csv_path = self._stream_csv(
+                    all_products, records, os.path.join(self.output_dir, f'{filename}.csv')
+                )
+                logger.info(f"Exported combined CSV: {csv_path}")
+            return
+        
+        df = self._to_dataframe(all_products, records)
+        
         # Export to CSV
-        if self.config.get('csv_enabled', True):
+        if self.csv_enabled:
             csv_path = os.path.join(self.output_dir, f'{filename}.csv')
             df.to_csv(csv_path, index=False, encoding='utf-8')
             logger.info(f"Exported combined CSV: {csv_path}")
         
         # Export to Excel
-        if self.config.get('excel_enabled', True):
+        if self.excel_enabled:
             excel_path = os.path.join(self.output_dir, f'{filename}.xlsx')
             
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+            with pd.ExcelWriter(excel_path, engine=self.excel_engine) as writer:
                 # All products
                 df.to_excel(writer, sheet_name='All Products', index=False)
                 
                 # By retailer
-                for retailer in df['retailer'].unique():
-                    retailer_df = df[df['retailer'] == retailer]
+                for retailer, retailer_df in df.groupby('retailer', sort=False):
                     sheet_name = f'{retailer}'[:31]  # Excel sheet name limit
                     retailer_df.to_excel(writer, sheet_name=sheet_name, index=False)
                 
                 # By country
-                for country in df['country'].unique():
-                    country_df = df[df['country'] == country]
+                for country, country_df in df.groupby('country', sort=False):
                     sheet_name = f'{country}'[:31]
                     country_df.to_excel(writer, sheet_name=sheet_name, index=False)
             
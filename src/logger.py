@@ -1,6 +1,7 @@
 """Logging configuration for the rice price scraper."""
 import logging
 import os
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from datetime import datetime
 
 
@@ -14,6 +15,8 @@ def setup_logging(config: dict):
     log_level = config.get('level', 'INFO')
     log_file = config.get('file', 'logs/scraper.log')
     console_enabled = config.get('console', True)
+    max_bytes = config.get('max_bytes', 10_000_000)
+    backup_count = config.get('backup_count', 3)
     
     # Create logs directory if it doesn't exist
     log_dir = os.path.dirname(log_file)
@@ -33,10 +36,16 @@ def setup_logging(config: dict):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # File handler: size-bounded, with records buffered in memory and
+    # written in batches (flushed immediately on errors)
+    rotating_handler = RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    rotating_handler.setFormatter(formatter)
+    file_handler = MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=rotating_handler
+    )
     file_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-    file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
     
     # Console handler
@@ -1,10 +1,10 @@
 """Data models for rice price scraping."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Represents a scraped rice product."""
     product_name: str
@@ -22,17 +22,25 @@ class Product:
     
     def to_dict(self):
         """Convert product to dictionary."""
-        return {
-            'product_name': self.product_name,
-            'pack_size': self.pack_size,
-            'currency': self.currency,
-            'regular_price': self.regular_price,
-            'promo_price': self.promo_price,
-            'is_promo': self.is_promo,
-            'availability': self.availability,
-            'product_url': self.product_url,
-            'retailer': self.retailer,
-            'country': self.country,
-            'category': self.category,
-            'scraped_at': self.scraped_at.isoformat()
-        }
+        return dict(zip(FIELDS, self.to_record_tuple()))
+    
+    def to_record_tuple(self) -> tuple:
+        """Convert product to a tuple in FIELDS order."""
+        return (
+            self.product_name,
+            self.pack_size,
+            self.currency,
+            self.regular_price,
+            self.promo_price,
+            self.is_promo,
+            self.availability,
+            self.product_url,
+            self.retailer,
+            self.country,
+            self.category,
+            self.scraped_at.isoformat()
+        )
+
+
+# Export column order, shared by to_dict() and to_record_tuple()
+FIELDS = tuple(f.name for f in fields(Product))
@@ -1,14 +1,41 @@
 """Main scraper orchestrator."""
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List
 from src.models import Product
 from src.scrapers.carrefour_scraper import CarrefourScraper
 from src.scrapers.lulu_scraper import LuluScraper
+from src.scrapers.browser_pool import BrowserPool
 from src.exporter import DataExporter
 
 
 logger = logging.getLogger(__name__)
 
+# (retailer, country) combinations scraped by scrape_all, in export order
+SCRAPE_JOBS = [
+    ('carrefour', 'uae'),
+    ('carrefour', 'ksa'),
+    ('lulu', 'uae'),
+    ('lulu', 'ksa'),
+]
+
+
+def _job_groups() -> List[tuple]:
+    """
+    Group SCRAPE_JOBS into units of work, one per retailer.
+    
+    Each retailer scrapes all of its countries concurrently in a single
+    browser.
+    
+    Returns:
+        List of (retailer, countries) tuples
+    """
+    groups = {}
+    for retailer, country in SCRAPE_JOBS:
+        groups.setdefault(retailer, []).append(country)
+    return list(groups.items())
+
 
 class RicePriceScraper:
     """Main orchestrator for rice price scraping."""
@@ -24,11 +51,19 @@ class RicePriceScraper:
         self.carrefour_scraper = CarrefourScraper(config)
         self.lulu_scraper = LuluScraper(config)
         self.exporter = DataExporter(config.get('output', {}))
+        # Per retailer/country files are opt-in; the combined export always runs
+        self.export_per_slice = config.get('output', {}).get('export_per_slice', False)
+        # Products serialized for per-slice export in the latest run, reused
+        # for the combined export; empty when per-slice export is off
+        self.records = []
     
     def scrape_all(self) -> List[Product]:
         """
         Scrape all retailers and countries.
         
+        Jobs run concurrently when ``parallel_scrape`` is enabled in the
+        configuration; results are always combined in job order.
+        
         Returns:
             List of all Product objects
         """
@@ -36,39 +71,50 @@ class RicePriceScraper:
         logger.info("Starting rice price scraping")
         logger.info("=" * 80)
         
-        all_products = []
+        self.records = []
+        results = {}
         
-        # Scrape Carrefour
-        for country in ['uae', 'ksa']:
-            try:
-                logger.info(f"\n{'=' * 40}")
-                logger.info(f"Scraping Carrefour {country.upper()}")
-                logger.info(f"{'=' * 40}")
-                
-                products = self.carrefour_scraper.scrape(country)
-                all_products.extend(products)
-                
-                # Export individual results
-                self.exporter.export(products, 'carrefour', country)
-                
-            except Exception as e:
-                logger.error(f"Error scraping Carrefour {country}: {e}", exc_info=True)
+        # Both retailers attach to one Chromium when shared_browser is set
+        with self._shared_browser():
+            if self.config.get('parallel_scrape', False):
+                groups = _job_groups()
+                with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                    futures = {
+                        executor.submit(self._scrape_group, retailer, countries): (retailer, countries)
+                        for retailer, countries in groups
+                    }
+                    for future in as_completed(futures):
+                        retailer, countries = futures[future]
+                        try:
+                            group_results = future.result()
+                        except Exception as e:
+                            logger.error(f"Error scraping {retailer} {'/'.join(countries)}: {e}", exc_info=True)
+                            continue
+                        
+                        # Export individual results from this thread only, so the
+                        # Excel/CSV writers are never used concurrently
+                        for country, products in group_results.items():
+                            self._collect(results, retailer, country, products)
+            else:
+                for retailer, countries in _job_groups():
+                    try:
+                        logger.info(f"\n{'=' * 40}")
+                        logger.info(f"Scraping {retailer.capitalize()} {'/'.join(c.upper() for c in countries)}")
+                        logger.info(f"{'=' * 40}")
+                        
+                        group_results = self._scrape_group(retailer, countries)
+                        for country, products in group_results.items():
+                            self._collect(results, retailer, country, products)
+                        
+                    except Exception as e:
+                        logger.error(f"Error scraping {retailer} {'/'.join(countries)}: {e}", exc_info=True)
         
-        # Scrape Lulu
-        for country in ['uae', 'ksa']:
-            try:
-                logger.info(f"\n{'=' * 40}")
-                logger.info(f"Scraping Lulu {country.upper()}")
-                logger.info(f"{'=' * 40}")
-                
-                products = self.lulu_scraper.scrape(country)
+        all_products = []
+        for job in SCRAPE_JOBS:
+            if job in results:
+                products, records = results[job]
                 all_products.extend(products)
-                
-                # Export individual results
-                self.exporter.export(products, 'lulu', country)
-                
-            except Exception as e:
-                logger.error(f"Error scraping Lulu {country}: {e}", exc_info=True)
+                self.records.extend(records)
         
         logger.info("=" * 80)
         logger.info(f"Scraping complete. Total products: {len(all_products)}")
@@ -76,6 +122,69 @@ class RicePriceScraper:
         
         return all_products
     
+    @contextmanager
+    def _shared_browser(self):
+        """
+        Run both scrapers against one shared Chromium inside the block.
+        
+        Does nothing unless ``shared_browser`` is enabled; if the shared
+        browser cannot start, each scraper launches its own as before.
+        """
+        if not self.config.get('shared_browser', False):
+            yield
+            return
+        
+        pool = BrowserPool()
+        try:
+            endpoint = pool.start()
+        except Exception as e:
+            logger.warning(f"Could not start shared browser, scrapers will launch their own: {e}")
+            yield
+            return
+        
+        self.carrefour_scraper.cdp_endpoint = endpoint
+        self.lulu_scraper.cdp_endpoint = endpoint
+        try:
+            yield
+        finally:
+            self.carrefour_scraper.cdp_endpoint = None
+            self.lulu_scraper.cdp_endpoint = None
+            pool.close()
+    
+    def _scrape_group(self, retailer: str, countries: List[str]) -> Dict[str, List[Product]]:
+        """
+        Scrape a retailer for a group of countries.
+        
+        Args:
+            retailer: Retailer name ('carrefour' or 'lulu')
+            countries: Country codes ('uae', 'ksa')
+            
+        Returns:
+            Dictionary mapping each country code to its Product objects
+        """
+        if retailer == 'carrefour':
+            return self.carrefour_scraper.scrape_countries(countries)
+        return self.lulu_scraper.scrape_countries(countries)
+    
+    def _collect(self, results: dict, retailer: str, country: str, products: List[Product]):
+        """
+        Store one retailer/country result and export it if enabled.
+        
+        Args:
+            results: Results keyed by (retailer, country)
+            retailer: Retailer name
+            country: Country code
+            products: Scraped Product objects
+        """
+        records = []
+        
+        # Export individual results
+        if self.export_per_slice:
+            records = [p.to_dict() for p in products]
+            self.exporter.export(products, retailer, country, records=records)
+        
+        results[(retailer, country)] = (products, records)
+    
     def scrape_retailer(self, retailer: str, country: str = None) -> List[Product]:
         """
         Scrape a specific retailer.
@@ -88,22 +197,29 @@ class RicePriceScraper:
             List of Product objects
         """
         products = []
+        self.records = []
         countries = [country] if country else ['uae', 'ksa']
         
+        if retailer.lower() not in ('carrefour', 'lulu'):
+            logger.error(f"Unknown retailer: {retailer}")
+            return products
+        
+        # All requested countries are scraped concurrently in one browser
+        results = {}
+        logger.info(f"Scraping {retailer.capitalize()} {'/'.join(c.upper() for c in countries)}")
+        try:
+            results = self._scrape_group(retailer.lower(), countries)
+        except Exception as e:
+            logger.error(f"Error scraping {retailer}: {e}", exc_info=True)
+        
         for ctry in countries:
             try:
-                if retailer.lower() == 'carrefour':
-                    logger.info(f"Scraping Carrefour {ctry.upper()}")
-                    prods = self.carrefour_scraper.scrape(ctry)
-                elif retailer.lower() == 'lulu':
-                    logger.info(f"Scraping Lulu {ctry.upper()}")
-                    prods = self.lulu_scraper.scrape(ctry)
-                else:
-                    logger.error(f"Unknown retailer: {retailer}")
-                    continue
-                
+                prods = results.get(ctry, [])
                 products.extend(prods)
-                self.exporter.export(prods, retailer, ctry)
+                if self.export_per_slice:
+                    records = [p.to_dict() for p in prods]
+                    self.records.extend(records)
+                    self.exporter.export(prods, retailer, ctry, records=records)
                 
             except Exception as e:
                 logger.error(f"Error scraping {retailer} {ctry}: {e}", exc_info=True)
@@ -0,0 +1,160 @@
+"""Shared Chromium instance that scrapers attach to over CDP."""
+import asyncio
+import logging
+import socket
+import threading
+from typing import Optional
+from playwright.async_api import async_playwright, Browser, Playwright, Route
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for Chromium to start or shut down
+STARTUP_TIMEOUT = 30
+
+# Requests the scrapers never need; only the HTML and its scripts matter
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'stylesheet', 'media'})
+BLOCKED_DOMAINS = ('google-analytics', 'doubleclick', 'facebook', 'hotjar', 'segment', 'optimizely')
+
+
+def _free_port() -> int:
+    """Ask the OS for a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BrowserPool:
+    """
+    One long-lived headless Chromium shared by all scrapers.
+    
+    The browser is launched through Playwright, so it gets Playwright's
+    usual flags (no sandbox, no /dev/shm, ...), with a remote debugging port
+    added. Scrapers connect with ``connect_over_cdp`` and open their own
+    contexts, so browser startup is paid once per run instead of once per
+    scraper. Playwright runs on a private event loop in a background thread,
+    so the pool can be started from any thread, even one with a running loop.
+    """
+    
+    def __init__(self, port: int = 0):
+        """
+        Initialize browser pool.
+        
+        Args:
+            port: Remote debugging port; 0 picks a free one
+        """
+        self.port = port
+        self.endpoint: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+    
+    def __enter__(self):
+        """Start the shared browser for the duration of the block."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the shared browser."""
+        self.close()
+    
+    def start(self) -> str:
+        """
+        Launch Chromium with remote debugging enabled.
+        
+        Returns:
+            HTTP endpoint of the browser, for ``connect_over_cdp``
+            
+        Raises:
+            Exception: Whatever Playwright raised if Chromium failed to
+                start; a browser that exits on startup fails right away
+        """
+        port = self.port or _free_port()
+        
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        
+        try:
+            self._run(self._launch(port))
+        except Exception:
+            self.close()
+            raise
+        
+        self.endpoint = f'http://127.0.0.1:{port}'
+        logger.info(f"Shared browser listening on {self.endpoint}")
+        return self.endpoint
+    
+    def close(self):
+        """Stop Chromium and the Playwright loop behind it."""
+        if self._loop is not None:
+            try:
+                self._run(self._shutdown())
+            except Exception as e:
+                logger.warning(f"Error closing shared browser: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        
+        self.endpoint = None
+    
+    def _run(self, coro):
+        """Run a coroutine on the pool's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(STARTUP_TIMEOUT)
+    
+    async def _launch(self, port: int):
+        """Start Playwright and launch Chromium listening on the given port."""
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=[f'--remote-debugging-port={port}']
+        )
+    
+    async def _shutdown(self):
+        """Close the browser and stop Playwright, whichever were started."""
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+        finally:
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+async def open_browser(playwright: Playwright, cdp_endpoint: Optional[str] = None) -> Browser:
+    """
+    Connect to the shared browser if there is one, else launch a new one.
+    
+    Closing a browser obtained over CDP only disconnects from it.
+    
+    Args:
+        playwright: Running Playwright instance
+        cdp_endpoint: Endpoint of a BrowserPool, if any
+        
+    Returns:
+        Playwright browser
+    """
+    if cdp_endpoint:
+        return await playwright.chromium.connect_over_cdp(cdp_endpoint)
+    return await playwright.chromium.launch(headless=True)
+
+
+async def block_resources(route: Route) -> None:
+    """
+    Abort heavy assets and tracker requests; let everything else through.
+    
+    Install with ``context.route('**/*', block_resources)``. Documents,
+    scripts, XHR and fetch are kept since prices are rendered by JS.
+    
+    Args:
+        route: Intercepted Playwright route
+    """
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(d in request.url for d in BLOCKED_DOMAINS):
+        await route.abort()
+    else:
+        await route.continue_()
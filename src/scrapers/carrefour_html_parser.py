@@ -0,0 +1,98 @@
+"""
+HTML parser for Carrefour product cards.
+Reads product cards from page HTML already fetched from the browser, so the
+DOM fallback needs no further round trips to the page.
+"""
+
+import logging
+from typing import List, Optional, Dict, Any
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Links identifying an element as a product card
+_LINK = 'a[href*="/mafuae/en/"], a[href*="/p/"]'
+
+_PRICE_SELECTORS = ('[class*="force-ltr"]', '[class*="items-center"][class*="ltr"]')
+_PRICE_PARTS = '[class*="font-bold"], [class*="text-lg"], [class*="text-xl"]'
+_PROMO_SELECTORS = ('[class*="special"]', '[class*="promo"]', '[class*="discount"]', '[class*="sale"]')
+_OUT_OF_STOCK = '[class*="out-of-stock"], [class*="unavailable"], button[disabled]'
+
+
+def extract_html_cards(page_content: str, selectors: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read product cards from page HTML.
+    
+    Mirrors the in-browser probe: the first selector matching more than
+    five elements that contain a product link wins, otherwise the product
+    links themselves are used.
+    
+    Args:
+        page_content: HTML content of the page
+        selectors: Card container selectors, most specific first
+        
+    Returns:
+        Dictionary with the matching ``selector`` (None for direct links)
+        and the ``cards`` read
+    """
+    tree = HTMLParser(page_content)
+    
+    for selector in selectors:
+        elements = [el for el in tree.css(selector) if el.css_first(_LINK) is not None]
+        if len(elements) > 5:  # Need multiple products
+            return {'selector': selector, 'cards': [_read_card(el) for el in elements]}
+    
+    links = tree.css('a[href*="/mafuae/en/"]')
+    return {'selector': None, 'cards': [_read_card(el) for el in links]}
+
+
+def _text(node) -> Optional[str]:
+    """
+    Text of a node on one line, or None if there is no node.
+    
+    Text runs are joined by spaces and whitespace is collapsed, so inline
+    markup such as ``<span>India Gate</span> <span>Basmati</span>`` reads
+    the way the browser's innerText shows it.
+    """
+    if node is None:
+        return None
+    return ' '.join(node.text(separator=' ').split())
+
+
+def _lines(node) -> Optional[str]:
+    """Text of a node with one line per text run, or None if there is no node."""
+    if node is None:
+        return None
+    return node.text(separator='\n', strip=True).strip()
+
+
+def _read_card(el) -> Dict[str, Any]:
+    """
+    Read the fields _parse_product_element needs from one card element.
+    
+    Args:
+        el: selectolax Node of the card
+        
+    Returns:
+        Dictionary of card fields
+    """
+    link = el if el.tag == 'a' else el.css_first(_LINK)
+    
+    price = None
+    for selector in _PRICE_SELECTORS:
+        price = el.css_first(selector)
+        if price is not None:
+            break
+    
+    name = _text(link)
+    
+    return {
+        'name': name,
+        # The whole card text is only needed when the link has no usable name
+        'text': None if name and len(name) >= 5 else _lines(el),
+        'href': link.attributes.get('href') if link is not None else None,
+        'price_text': _text(price),
+        'price_parts': [_text(part) for part in el.css(_PRICE_PARTS)],
+        'promo_texts': [_text(el.css_first(selector)) for selector in _PROMO_SELECTORS],
+        'out_of_stock': el.css_first(_OUT_OF_STOCK) is not None,
+    }
@@ -1,19 +1,30 @@
 """
 JSON parser for Carrefour product data.
-Extracts product information from JSON embedded in page content.
+Extracts product information from JSON embedded in page content or
+returned by the search API.
 """
 
 import json
 import re
 import logging
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import Iterator, List, Optional, Dict, Any
 from src.models import Product
 from src.utils import extract_pack_size, filter_by_category
 
 logger = logging.getLogger(__name__)
 
+# Start of each dataLayer push call's array argument, and the products
+# marker used when that array is not plain JSON
+_PUSH = re.compile(re.escape('window.dataLayer.push(['))
+_PRODUCTS = '"products":['
 
-def extract_json_products(page_content: str, base_url: str, country: str) -> List[Product]:
+# Shared decoder; raw_decode parses in place from an offset into the page
+_DECODER = json.JSONDecoder()
+
+
+def extract_json_products(page_content: str, base_url: str, country: str,
+                          filters: dict) -> List[Product]:
     """
     Extract products from JSON data embedded in page HTML.
     
@@ -21,6 +32,7 @@ def extract_json_products(page_content: str, base_url: str, country: str) -> Lis
         page_content: HTML content of the page
         base_url: Base URL for constructing product URLs
         country: Country code (uae, ksa)
+        filters: Category regex patterns from config
         
     Returns:
         List of Product objects
@@ -28,80 +40,22 @@ def extract_json_products(page_content: str, base_url: str, country: str) -> Lis
     products = []
     
     try:
-        # Step 1: Find the dataLayer script with products
-        # Look for window.dataLayer.push with products array
-        start_marker = 'window.dataLayer.push(['
-        products_marker = '"products":['
-        
-        start_idx = page_content.find(start_marker)
-        if start_idx == -1:
+        # Step 1: Find the dataLayer push calls
+        match = _PUSH.search(page_content)
+        if match is None:
             logger.debug("No dataLayer.push found")
             return []
         
-        # Find products array within the dataLayer push
-        products_start = page_content.find(products_marker, start_idx)
-        if products_start == -1:
-            logger.debug("No products array found in dataLayer")
-            return []
+        # Step 2: Take the products from the first call that has any
+        while match is not None:
+            next_match = _PUSH.search(page_content, match.end())
+            limit = next_match.start() if next_match else len(page_content)
+            product_data = _push_products(page_content, match.end() - 1, limit)
+            if product_data:
+                return parse_product_list(product_data, base_url, country, filters)
+            match = next_match
         
-        # Find the start of the products array
-        array_start = products_start + len('"products":')
-        
-        # Find the matching closing bracket for the products array
-        # Count brackets to find the end
-        bracket_count = 0
-        array_end = array_start
-        in_string = False
-        escape_next = False
-        
-        for i in range(array_start, min(array_start + 2000000, len(page_content))):
-            char = page_content[i]
-            
-            if escape_next:
-                escape_next = False
-                continue
-            
-            if char == '\\':
-                escape_next = True
-                continue
-            
-            if char == '"':
-                in_string = not in_string
-                continue
-            
-            if not in_string:
-                if char == '[':
-                    bracket_count += 1
-                elif char == ']':
-                    bracket_count -= 1
-                    if bracket_count == 0:
-                        array_end = i + 1
-                        break
-        
-        if array_end <= array_start:
-            logger.debug("Could not find end of products array")
-            return []
-        
-        # Extract and parse the JSON array
-        json_str = page_content[array_start:array_end]
-        
-        try:
-            product_data = json.loads(json_str)
-            if isinstance(product_data, list):
-                logger.info(f"Found {len(product_data)} products in JSON data")
-                
-                # Parse each product
-                for item in product_data:
-                    product = parse_json_product(item, base_url, country)
-                    if product:
-                        products.append(product)
-                
-                logger.info(f"Successfully parsed {len(products)} products from JSON")
-            else:
-                logger.debug("Products data is not a list")
-        except json.JSONDecodeError as e:
-            logger.debug(f"JSON decode error: {str(e)[:200]}")
-            return []
+        logger.debug("No products array found in dataLayer")
         
     except Exception as e:
         logger.error(f"Error extracting JSON products: {e}")
@@ -109,7 +63,134 @@ def extract_json_products(page_content: str, base_url: str, country: str) -> Lis
     return products
 
 
-def parse_json_product(data: Dict[str, Any], base_url: str, country: str) -> Optional[Product]:
+def _push_products(page_content: str, array_start: int, limit: int) -> Optional[List[Any]]:
+    """
+    Find the products array passed to one dataLayer push call.
+    
+    Args:
+        page_content: HTML content of the page
+        array_start: Offset of the opening bracket of the call's array
+        limit: Offset of the next push call, or the end of the page
+        
+    Returns:
+        Products list, or None if this call has none
+    """
+    # Decode the call's array in C straight from the page string; the
+    # decoder finds where it ends, whatever its strings contain, so a
+    # "products" key elsewhere on the page is never picked up
+    try:
+        push_args, _ = _DECODER.raw_decode(page_content, array_start)
+    except json.JSONDecodeError:
+        pass
+    else:
+        return _find_products(push_args)
+    
+    # Not plain JSON (e.g. JavaScript literals): look for the products
+    # marker before the next push call and decode just that array
+    products_start = page_content.find(_PRODUCTS, array_start, limit)
+    if products_start == -1:
+        return None
+    try:
+        product_data, _ = _DECODER.raw_decode(page_content, products_start + len(_PRODUCTS) - 1)
+    except json.JSONDecodeError as e:
+        logger.debug("JSON decode error: %s", str(e)[:200])
+        return None
+    return product_data
+
+
+def _find_products(payload: Any) -> Optional[List[Any]]:
+    """
+    Find the first ``products`` list in a decoded payload, breadth-first.
+    
+    Args:
+        payload: Decoded JSON value
+        
+    Returns:
+        Products list, or None if there is none
+    """
+    queue = [payload]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, list):
+            queue.extend(item for item in node if isinstance(item, (dict, list)))
+        elif isinstance(node, dict):
+            if isinstance(node.get('products'), list):
+                return node['products']
+            queue.extend(v for v in node.values() if isinstance(v, (dict, list)))
+    return None
+
+
+def extract_api_products(payload: Any, base_url: str, country: str,
+                         filters: dict) -> Optional[List[Product]]:
+    """
+    Extract products from a Carrefour search API response body.
+    
+    The products array is taken from the first ``products`` key found in
+    the payload (breadth-first), or from the payload itself if it is a list.
+    
+    Args:
+        payload: Decoded JSON response body
+        base_url: Base URL for constructing product URLs
+        country: Country code (uae, ksa)
+        filters: Category regex patterns from config
+        
+    Returns:
+        List of Product objects, or None if no products array was found
+    """
+    product_data = payload if isinstance(payload, list) else _find_products(payload)
+    if product_data is None:
+        logger.debug("No products array found in API response")
+        return None
+    return parse_product_list(product_data, base_url, country, filters)
+
+
+def parse_product_list(product_data: List[Dict[str, Any]], base_url: str, country: str,
+                       filters: dict) -> List[Product]:
+    """
+    Parse a list of product dictionaries, skipping rows that don't match.
+    
+    Args:
+        product_data: List of product data dictionaries
+        base_url: Base URL for constructing product URLs
+        country: Country code (uae, ksa)
+        filters: Category regex patterns from config
+        
+    Returns:
+        List of Product objects
+    """
+    logger.info(f"Found {len(product_data)} products in JSON data")
+    
+    products = list(iter_product_list(product_data, base_url, country, filters))
+    
+    logger.info(f"Successfully parsed {len(products)} products from JSON")
+    return products
+
+
+def iter_product_list(product_data: List[Dict[str, Any]], base_url: str, country: str,
+                      filters: dict) -> Iterator[Product]:
+    """
+    Lazily parse a list of product dictionaries, skipping rows that don't match.
+    
+    Args:
+        product_data: List of product data dictionaries
+        base_url: Base URL for constructing product URLs
+        country: Country code (uae, ksa)
+        filters: Category regex patterns from config
+        
+    Yields:
+        Product objects, one at a time
+    """
+    # One timestamp for the whole page
+    scraped_at = datetime.now()
+    
+    for item in product_data:
+        product = parse_json_product(item, base_url, country, filters, scraped_at)
+        if product:
+            yield product
+
+
+def parse_json_product(data: Dict[str, Any], base_url: str, country: str,
+                       filters: dict, scraped_at: Optional[datetime] = None) -> Optional[Product]:
     """
     Parse a single product from JSON data.
     
@@ -117,6 +198,8 @@ def parse_json_product(data: Dict[str, Any], base_url: str, country: str) -> Opt
         data: Product data dictionary
         base_url: Base URL
         country: Country code
+        filters: Category regex patterns from config
+        scraped_at: Optional scrape timestamp shared by the whole page
         
     Returns:
         Product object or None
@@ -127,18 +210,21 @@ def parse_json_product(data: Dict[str, Any], base_url: str, country: str) -> Opt
         if not product_name or len(product_name) < 5:
             return None
         
-        # Filter by category
-        category = filter_by_category(product_name)
+        # Filter by category before any other work; most rows are rejected here
+        category = filter_by_category(product_name, filters)
         if not category:
             return None
         
-        # Extract price information
-        price_info = data.get('price', {})
-        regular_price = float(price_info.get('price', 0))
+        # Extract price information, skipping unpriced rows early
+        price_info = data.get('price') or {}
+        regular_price_raw = price_info.get('price')
+        if regular_price_raw in (None, 0, '0'):
+            return None
+        regular_price = float(regular_price_raw)
         
         # Check for discount/promo price
         promo_price = None
-        discount_info = price_info.get('discount', {})
+        discount_info = price_info.get('discount')
         if discount_info:
             promo_price = float(discount_info.get('price', 0))
         
@@ -186,12 +272,13 @@ def parse_json_product(data: Dict[str, Any], base_url: str, country: str) -> Opt
             product_url=product_url,
             retailer='Carrefour',
             country=country.upper(),
-            category=category
+            category=category,
+            scraped_at=scraped_at or datetime.now()
         )
         
-        logger.debug(f"Parsed JSON product: {product_name} - {currency}{regular_price}")
+        logger.debug("Parsed JSON product: %s - %s%s", product_name, currency, regular_price)
         return product
         
     except Exception as e:
-        logger.debug(f"Error parsing JSON product: {e}")
+        logger.debug("Error parsing JSON product: %s", e)
         return None
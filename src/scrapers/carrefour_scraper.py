@@ -1,17 +1,134 @@
-"""Carrefour scraper using Playwright (same approach as Lulu)."""
+"""Carrefour scraper using the search API, with async Playwright as a fallback."""
+import asyncio
+import hashlib
 import logging
+import multiprocessing
+import os
+import random
+import re
 import time
-from typing import List
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeout
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, List, Optional
+import requests
+from playwright.async_api import async_playwright, Browser, Page, Playwright, TimeoutError as PlaywrightTimeout
 from src.models import Product
-from src.utils import extract_pack_size, filter_by_category, clean_price
+from src.scrapers.browser_pool import block_resources, open_browser
+from src.scrapers.carrefour_html_parser import extract_html_cards
+from src.scrapers.carrefour_json_parser import extract_api_products, extract_json_products
+from src.utils import extract_pack_size, filter_by_category, clean_price, compile_category_patterns
 
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+VIEWPORT = {'width': 1920, 'height': 1080}
+
+# DOM predicates waited on instead of fixed sleeps
+DATALAYER_READY_JS = (
+    "() => Array.from(document.scripts).some(s => s.text.includes('window.dataLayer.push(['))"
+)
+PRODUCTS_RENDERED_JS = "document.querySelectorAll('a[href*=\"/p/\"]').length > 0"
+
+# Scrolls to the bottom and clicks 'Load More' until the page stops
+# growing or maxScrolls is reached, waiting on height changes rather
+# than fixed delays; returns how many scrolls and clicks were made
+SCROLL_PAGE_JS = '''async maxScrolls => {
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    const waitForGrowth = async (height, timeout) => {
+        const deadline = Date.now() + timeout;
+        while (document.body.scrollHeight <= height && Date.now() < deadline) {
+            await sleep(100);
+        }
+    };
+    let scrolls = 0;
+    let clicks = 0;
+    while (scrolls < maxScrolls) {
+        scrolls++;
+        const height = document.body.scrollHeight;
+        window.scrollTo(0, height);
+        await waitForGrowth(height, 2000);
+        const loadMore = Array.from(document.querySelectorAll('button')).find(btn => {
+            const label = btn.textContent.toLowerCase();
+            return label.includes('load') || label.includes('more');
+        });
+        if (loadMore && loadMore.offsetParent !== null) {
+            loadMore.click();
+            clicks++;
+            await waitForGrowth(document.body.scrollHeight, 3000);
+        }
+        if (document.body.scrollHeight === height) {
+            break;  // No new content loaded
+        }
+    }
+    window.scrollTo(0, 0);
+    return {scrolls, clicks};
+}'''
+
+# Price text patterns, e.g. "28.79AED" or "28\n.79\nAED"
+_WS_TBL = str.maketrans('', '', ' \t\r\n\u00a0')
+_PRICE_DEC_RE = re.compile(r'\d+\.\d+')
+_PRICE_INT_RE = re.compile(r'\d+')
+
+# Keywords identifying a rice product name in a card's text lines
+_RICE_RE = re.compile(r'rice|basmati|jasmine|sella', re.IGNORECASE)
+
+# Carrefour product card containers, most specific first
+PRODUCT_SELECTORS = [
+    'div[class*="product"]',  # Product card container
+    'article',
+    'li[class*="product"]',
+    '[data-testid*="product"]',
+    'div[class*="relative"][class*="flex"]'  # Common container class on Carrefour
+]
+
+# Reads every field _parse_product_element needs from one product element
+READ_CARD_JS = '''el => {
+    const LINK = 'a[href*="/mafuae/en/"], a[href*="/p/"]';
+    const text = node => node ? (node.innerText || '').trim() : null;
+    const link = el.tagName.toLowerCase() === 'a' ? el : el.querySelector(LINK);
+    const price = el.querySelector('[class*="force-ltr"]')
+        || el.querySelector('[class*="items-center"][class*="ltr"]');
+    const name = text(link);
+    return {
+        name: name,
+        // The whole card text is only needed when the link has no usable name
+        text: name && name.length >= 5 ? null : text(el),
+        href: link ? link.getAttribute('href') : null,
+        price_text: text(price),
+        price_parts: Array.from(
+            el.querySelectorAll('[class*="font-bold"], [class*="text-lg"], [class*="text-xl"]'),
+            part => (part.innerText || '').trim()
+        ),
+        promo_texts: ['[class*="special"]', '[class*="promo"]', '[class*="discount"]', '[class*="sale"]']
+            .map(selector => text(el.querySelector(selector))),
+        out_of_stock: !!el.querySelector(
+            '[class*="out-of-stock"], [class*="unavailable"], button[disabled]'
+        ),
+    };
+}'''
+
+# Probes PRODUCT_SELECTORS in order inside the page and reads the cards of
+# the first one matching more than five elements with a product link,
+# falling back to the product links themselves (selector is then null), so
+# the whole extraction is a single round trip
+PRODUCT_CARDS_JS = '''selectors => {
+    const readCard = %s;
+    for (const selector of selectors) {
+        const elements = Array.from(document.querySelectorAll(selector))
+            .filter(el => el.querySelector('a[href*="/mafuae/en/"], a[href*="/p/"]'));
+        if (elements.length > 5) {  // Need multiple products
+            return {selector, cards: elements.map(readCard)};
+        }
+    }
+    const links = Array.from(document.querySelectorAll('a[href*="/mafuae/en/"]'));
+    return {selector: null, cards: links.map(readCard)};
+}''' % READ_CARD_JS
+
 
 class CarrefourScraper:
-    """Scraper for Carrefour using Playwright for dynamic content."""
+    """Scraper for Carrefour using its JSON API or Playwright for dynamic content."""
     
     def __init__(self, config: dict):
         """
@@ -22,7 +139,27 @@ class CarrefourScraper:
         """
         self.config = config
         self.retry_config = config.get('retry', {})
-        self.filters = config.get('filters', {})
+        # Category patterns compiled once, not per product
+        self.filters = compile_category_patterns(config.get('filters', {}))
+        
+        # Development cache of rendered search pages, see config.yaml
+        cache_config = config.get('html_cache', {})
+        self.cache_enabled = cache_config.get('enabled', False)
+        self.cache_dir = cache_config.get('dir', 'output/.cache')
+        self.cache_ttl = cache_config.get('ttl_hours', 12) * 3600
+        
+        # Optional persistent browser profile; cookies and the HTTP cache
+        # then survive between runs
+        self.profile_dir = config.get('carrefour', {}).get('profile_dir')
+        
+        # Endpoint of a shared BrowserPool; set by the orchestrator
+        self.cdp_endpoint = None
+        
+        # Scrape each country in its own process instead of one event loop
+        self.process_per_country = config.get('carrefour', {}).get('process_per_country', False)
+        
+        # Write each scraped page to output/ for debugging selectors
+        self.dump_html = config.get('debug', {}).get('dump_html', False)
     
     def scrape(self, country: str) -> List[Product]:
         """
@@ -34,168 +171,397 @@ class CarrefourScraper:
         Returns:
             List of Product objects
         """
-        logger.info(f"Starting Carrefour scrape for {country.upper()}")
+        return self.scrape_countries([country])[country]
+    
+    def scrape_countries(self, countries: List[str]) -> Dict[str, List[Product]]:
+        """
+        Scrape Carrefour for several countries concurrently.
         
-        country_config = self.config['carrefour'].get(country)
-        if not country_config:
-            logger.error(f"No configuration for Carrefour {country}")
-            return []
+        Args:
+            countries: Country codes, e.g. ['uae', 'ksa']
+            
+        Returns:
+            Dictionary mapping each country code to its Product objects
+        """
+        if self.process_per_country and len(countries) > 1:
+            # Each worker owns its own Playwright and Chromium and parses
+            # its pages on its own interpreter. Workers are spawned, not
+            # forked, since this may run on an orchestrator thread, and
+            # send their log records back to this process's handlers.
+            mp_context = multiprocessing.get_context('spawn')
+            log_queue = mp_context.Queue()
+            listener = QueueListener(
+                log_queue, *logging.getLogger().handlers, respect_handler_level=True
+            )
+            listener.start()
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=len(countries), mp_context=mp_context,
+                    initializer=_init_worker_logging, initargs=(log_queue, _logger_levels())
+                ) as executor:
+                    scraped = executor.map(
+                        _scrape_in_process, repeat(self.config), countries, repeat(self.cdp_endpoint)
+                    )
+                    return dict(zip(countries, scraped))
+            finally:
+                listener.stop()
         
-        products = []
+        return asyncio.run(self.scrape_all(countries))
+    
+    async def scrape_all(self, countries: List[str]) -> Dict[str, List[Product]]:
+        """
+        Scrape Carrefour for several countries concurrently.
+        
+        Countries with a search API are fetched in worker threads. The rest
+        share one browser, each in its own context, so their page loads and
+        scroll waits overlap instead of running back to back.
         
-        with sync_playwright() as p:
+        Args:
+            countries: Country codes, e.g. ['uae', 'ksa']
+            
+        Returns:
+            Dictionary mapping each country code to its Product objects
+        """
+        results = {}
+        country_configs = {}
+        
+        for country in countries:
+            logger.info(f"Starting Carrefour scrape for {country.upper()}")
+            country_config = self.config['carrefour'].get(country)
+            if not country_config:
+                logger.error(f"No configuration for Carrefour {country}")
+                results[country] = []
+            else:
+                country_configs[country] = country_config
+        
+        # Prefer the JSON search API; the browser is only needed as a fallback
+        api_results = await asyncio.gather(*(
+            asyncio.to_thread(self._scrape_via_api, country_config, country)
+            for country, country_config in country_configs.items()
+        ))
+        
+        browser_countries = []
+        for country, products in zip(country_configs, api_results):
+            if products is None:
+                browser_countries.append(country)
+            else:
+                results[country] = products
+        
+        # Serve pages cached by an earlier run without starting a browser
+        if self.cache_enabled:
+            for country in list(browser_countries):
+                products = self._scrape_from_cache(country_configs[country], country)
+                if products:
+                    results[country] = products
+                    browser_countries.remove(country)
+        
+        if browser_countries:
             try:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                )
-                page = context.new_page()
-                
-                # Scrape products
-                products = self._scrape_with_page(page, country_config, country)
-                
-                browser.close()
-                logger.info(f"Total products from Carrefour {country.upper()}: {len(products)}")
-                
+                async with async_playwright() as p:
+                    # Persistent profiles give each country its own context;
+                    # otherwise all countries share one browser
+                    browser = None if self.profile_dir else await open_browser(p, self.cdp_endpoint)
+                    try:
+                        scraped = await asyncio.gather(*(
+                            self._scrape_country(p, browser, country_configs[country], country)
+                            for country in browser_countries
+                        ))
+                    finally:
+                        if browser is not None:
+                            await browser.close()
+                results.update(zip(browser_countries, scraped))
             except Exception as e:
-                logger.error(f"Error during Carrefour scraping for {country}: {e}")
+                logger.error(f"Error launching browser for Carrefour: {e}")
+                for country in browser_countries:
+                    results.setdefault(country, [])
         
-        return products
+        for country in countries:
+            logger.info(f"Total products from Carrefour {country.upper()}: {len(results[country])}")
+        
+        return {country: results[country] for country in countries}
     
-    def _scrape_with_page(self, page: Page, country_config: dict, country: str) -> List[Product]:
+    async def _scrape_country(self, playwright: Playwright, browser: Optional[Browser],
+                              country_config: dict, country: str) -> List[Product]:
         """
-        Scrape products using Playwright page.
+        Scrape products in a fresh context of the given browser, or in a
+        persistent context when a profile directory is configured.
+        
+        Timed-out attempts are retried in a new context (a new page for
+        persistent profiles) without relaunching the browser.
         
         Args:
-            page: Playwright page object
+            playwright: Running Playwright instance
+            browser: Shared Playwright browser, or None to use a profile
             country_config: Country-specific configuration
             country: Country code
             
         Returns:
             List of Product objects
         """
-        products = []
-        search_url = country_config['search_url']
-        search_term = country_config['search_term']
-        
-        # Navigate to search page
-        full_url = f"{search_url}?keyword={search_term.replace(' ', '+')}"
-        
         attempt = 0
         max_attempts = self.retry_config.get('max_attempts', 3)
         delay = self.retry_config.get('delay_seconds', 2)
         backoff = self.retry_config.get('backoff_multiplier', 2)
         
-        while attempt < max_attempts:
-            try:
-                logger.info(f"Navigating to: {full_url}")
-                page.goto(full_url, wait_until='domcontentloaded', timeout=30000)
+        # Navigation budget grows with each attempt: fail fast first, then
+        # give slow responses more time, up to a cap
+        timeout = self.retry_config.get('goto_timeout_ms', 8000)
+        max_timeout = self.retry_config.get('max_goto_timeout_ms', 25000)
+        
+        persistent = None
+        try:
+            if browser is None:
+                # One profile per country; Chromium locks a profile directory
+                persistent = await playwright.chromium.launch_persistent_context(
+                    f"{self.profile_dir}-{country}",
+                    headless=True,
+                    viewport=VIEWPORT,
+                    user_agent=USER_AGENT
+                )
+                await persistent.route('**/*', block_resources)
+            
+            while True:
+                if persistent is not None:
+                    context = persistent
+                else:
+                    # A fresh context per attempt; a timed-out page may be stuck loading
+                    context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+                    await context.route('**/*', block_resources)
                 
-                # Wait for page to load
+                page = None
                 try:
-                    page.wait_for_load_state('load', timeout=20000)
-                    time.sleep(3)  # Additional wait for dynamic content
-                except Exception:
-                    time.sleep(3)  # Fallback wait
-                
-                # Scroll to load more products
-                self._scroll_page(page)
-                
-                # Optional: Save HTML for debugging
-                if logger.level <= 10:  # DEBUG level
-                    try:
-                        html_path = f"output/debug_carrefour_{country}.html"
-                        with open(html_path, 'w', encoding='utf-8') as f:
-                            f.write(page.content())
-                        logger.debug(f"Saved page HTML to {html_path}")
-                    except Exception as e:
-                        logger.debug(f"Could not save HTML: {e}")
-                
-                # Extract products
-                products = self._extract_products(page, country_config['base_url'], country)
-                break
-                
-            except PlaywrightTimeout as e:
-                attempt += 1
-                logger.warning(f"Attempt {attempt}/{max_attempts} timed out: {e}")
-                
-                if attempt < max_attempts:
-                    time.sleep(delay)
+                    page = await context.new_page()
+                    return await self._scrape_with_page(page, country_config, country, timeout)
+                    
+                except PlaywrightTimeout as e:
+                    attempt += 1
+                    logger.warning(f"Attempt {attempt}/{max_attempts} timed out: {e}")
+                    
+                    if attempt >= max_attempts:
+                        logger.error("Max retries reached")
+                        raise
+                    
+                    # Jittered so parallel countries don't retry in lockstep
+                    await asyncio.sleep(delay * (1 + random.random() * 0.25))
                     delay *= backoff
-                else:
-                    logger.error("Max retries reached")
-                    raise
+                    timeout = min(timeout * backoff, max_timeout)
+                
+                finally:
+                    if context is not persistent:
+                        await context.close()
+                    elif page is not None:
+                        await page.close()
             
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                raise
+        except Exception as e:
+            logger.error(f"Error during Carrefour scraping for {country}: {e}")
+            return []
         
-        return products
+        finally:
+            if persistent is not None:
+                await persistent.close()
     
-    def _scroll_page(self, page: Page):
+    def _scrape_via_api(self, country_config: dict, country: str) -> Optional[List[Product]]:
         """
-        Scroll page and click 'Load More' button to load all products.
+        Scrape products from the Carrefour search API.
         
         Args:
-            page: Playwright page object
+            country_config: Country-specific configuration
+            country: Country code
+            
+        Returns:
+            List of Product objects, or None if no API is configured or the
+            request failed and the Playwright path should be used instead
         """
+        api_url = country_config.get('api_url')
+        if not api_url:
+            return None
+        
+        params = {
+            'keyword': country_config['search_term'],
+            'pageSize': country_config.get('api_page_size', 60),
+        }
+        headers = {'User-Agent': USER_AGENT, **country_config.get('api_headers', {})}
+        
         try:
-            previous_height = 0
-            max_scrolls = 10
+            logger.info(f"Requesting Carrefour API: {api_url}")
+            response = requests.get(api_url, params=params, headers=headers, timeout=15)
+        except requests.RequestException as e:
+            logger.warning(f"Carrefour API request failed: {e}, falling back to browser")
+            return None
+        
+        if response.status_code != 200:
+            logger.warning(
+                f"Carrefour API returned HTTP {response.status_code}, falling back to browser"
+            )
+            return None
+        
+        try:
+            payload = response.json()
+        except ValueError as e:
+            logger.warning(f"Carrefour API returned invalid JSON: {e}, falling back to browser")
+            return None
+        
+        return extract_api_products(payload, country_config['base_url'], country, self.filters)
+    
+    @staticmethod
+    def _search_page_url(country_config: dict) -> str:
+        """Build the search page URL for a country."""
+        search_term = country_config['search_term']
+        return f"{country_config['search_url']}?keyword={search_term.replace(' ', '+')}"
+    
+    def _html_cache_path(self, url: str) -> str:
+        """Path of the cached HTML for a URL."""
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html")
+    
+    def _read_html_cache(self, url: str) -> Optional[str]:
+        """
+        Read cached HTML for a URL.
+        
+        Args:
+            url: Page URL
             
-            for scroll_attempt in range(max_scrolls):
-                # Get current scroll height
-                current_height = page.evaluate('document.body.scrollHeight')
-                
-                # Scroll to bottom
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                time.sleep(2)
-                
-                # Try to click "Load More" button
-                try:
-                    load_more_clicked = page.evaluate('''() => {
-                        const buttons = Array.from(document.querySelectorAll('button'));
-                        const loadMore = buttons.find(btn => 
-                            btn.textContent.toLowerCase().includes('load') || 
-                            btn.textContent.toLowerCase().includes('more')
-                        );
-                        if (loadMore && loadMore.offsetParent !== null) {
-                            loadMore.click();
-                            return true;
-                        }
-                        return false;
-                    }''')
-                    
-                    if load_more_clicked:
-                        logger.info(f"Clicked 'Load More' button (scroll #{scroll_attempt + 1})")
-                        time.sleep(3)
-                    
-                except Exception as e:
-                    logger.debug(f"No Load More button: {e}")
-                
-                # Check if page height changed
-                new_height = page.evaluate('document.body.scrollHeight')
-                if new_height == previous_height:
-                    # No new content loaded, stop scrolling
-                    logger.info(f"No more content to load after {scroll_attempt + 1} scrolls")
-                    break
-                    
-                previous_height = current_height
+        Returns:
+            Cached HTML, or None if missing or older than the TTL
+        """
+        path = self._html_cache_path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_html_cache(self, url: str, html: str):
+        """
+        Store rendered HTML for a URL.
+        
+        Args:
+            url: Page URL
+            html: Page HTML
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._html_cache_path(url), 'w', encoding='utf-8') as f:
+                f.write(html)
+        except OSError as e:
+            logger.warning(f"Could not write HTML cache: {e}")
+    
+    def _dump_html(self, country: str, html: str):
+        """
+        Save page HTML for debugging.
+        
+        Args:
+            country: Country code
+            html: Page HTML
+        """
+        html_path = f"output/debug_carrefour_{country}.html"
+        try:
+            with open(html_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            logger.debug("Saved page HTML to %s", html_path)
+        except Exception as e:
+            logger.debug("Could not save HTML: %s", e)
+    
+    def _scrape_from_cache(self, country_config: dict, country: str) -> Optional[List[Product]]:
+        """
+        Parse products from a cached search page.
+        
+        Args:
+            country_config: Country-specific configuration
+            country: Country code
             
-            # Scroll back to top
-            page.evaluate('window.scrollTo(0, 0)')
-            time.sleep(1)
+        Returns:
+            List of Product objects, or None on a cache miss
+        """
+        url = self._search_page_url(country_config)
+        html = self._read_html_cache(url)
+        if html is None:
+            return None
+        
+        logger.info(f"Using cached HTML for {url}")
+        return extract_json_products(html, country_config['base_url'], country, self.filters)
+    
+    async def _scrape_with_page(self, page: Page, country_config: dict, country: str,
+                                timeout: float = 15000) -> List[Product]:
+        """
+        Scrape products using Playwright page, in a single attempt.
+        
+        Args:
+            page: Playwright page object
+            country_config: Country-specific configuration
+            country: Country code
+            timeout: Navigation timeout for this attempt in milliseconds
+            
+        Returns:
+            List of Product objects
             
+        Raises:
+            PlaywrightTimeout: If navigation times out
+        """
+        # Navigate to search page
+        full_url = self._search_page_url(country_config)
+        
+        logger.info(f"Navigating to: {full_url}")
+        await page.goto(full_url, wait_until='commit', timeout=timeout)
+        
+        # Wait for the dataLayer script the JSON parser reads, not the full load
+        try:
+            await page.wait_for_function(DATALAYER_READY_JS, timeout=timeout)
+        except PlaywrightTimeout:
+            logger.debug("No dataLayer script found on page")
+        
+        # Wait for product links to render rather than a fixed delay
+        try:
+            await page.wait_for_function(PRODUCTS_RENDERED_JS, timeout=8000)
+        except PlaywrightTimeout:
+            logger.debug("No product links rendered after load")
+        
+        # Scroll to load more products
+        await self._scroll_page(page)
+        
+        # Serialize the DOM once; the cache, the debug dump and the
+        # JSON extractor all share this string
+        page_content = await page.content()
+        
+        # Keep the rendered page for development reruns
+        if self.cache_enabled:
+            self._write_html_cache(full_url, page_content)
+        
+        # Optional: Save HTML for debugging, off the event loop
+        if self.dump_html:
+            await asyncio.to_thread(self._dump_html, country, page_content)
+        
+        # Extract products
+        return await self._extract_products(
+            page, page_content, country_config['base_url'], country
+        )
+    
+    async def _scroll_page(self, page: Page):
+        """
+        Scroll page and click 'Load More' button to load all products.
+        
+        The whole loop runs inside the page in one evaluate call.
+        
+        Args:
+            page: Playwright page object
+        """
+        try:
+            stats = await page.evaluate(SCROLL_PAGE_JS, 10)
+            logger.info(
+                f"Scrolled {stats['scrolls']} times, clicked 'Load More' {stats['clicks']} times"
+            )
         except Exception as e:
             logger.warning(f"Error during page scroll: {e}")
     
-    def _extract_products(self, page: Page, base_url: str, country: str) -> List[Product]:
+    async def _extract_products(self, page: Page, page_content: str, base_url: str,
+                                country: str) -> List[Product]:
         """
         Extract products from the page.
         
         Args:
             page: Playwright page object
+            page_content: Page HTML, already read by the caller
             base_url: Base URL for constructing product URLs
             country: Country code
             
@@ -206,9 +572,7 @@ class CarrefourScraper:
         
         # Try JSON extraction first (more reliable for Carrefour)
         try:
-            from src.scrapers.carrefour_json_parser import extract_json_products
-            page_content = page.content()
-            products = extract_json_products(page_content, base_url, country)
+            products = extract_json_products(page_content, base_url, country, self.filters)
             
             if products:
                 logger.info(f"Extracted {len(products)} products from JSON data")
@@ -218,58 +582,59 @@ class CarrefourScraper:
         except Exception as e:
             logger.warning(f"JSON extraction failed: {e}, using HTML parsing")
         
-        #Try multiple selectors for Carrefour
-        product_selectors = [
-            'div[class*="product"]',  # Product card container
-            'article',
-            'li[class*="product"]',
-            '[data-testid*="product"]',
-            'div[class*="relative"][class*="flex"]'  # Common container class on Carrefour
-        ]
-        
-        product_elements = []
-        for selector in product_selectors:
-            try:
-                elements = page.query_selector_all(selector)
-                # Filter to elements that contain product links
-                filtered = [el for el in elements if el.query_selector('a[href*="/mafuae/en/"]') or el.query_selector('a[href*="/p/"]')]
-                if filtered and len(filtered) > 5:  # Need multiple products
-                    product_elements = filtered
-                    logger.info(f"Found {len(filtered)} product containers using selector: {selector}")
-                    break
-            except Exception as e:
-                logger.debug(f"Selector {selector} failed: {e}")
-        
-        # If no containers found, fallback to direct link selection
-        if not product_elements:
-            logger.info("Falling back to direct link selection")
-            product_elements = page.query_selector_all('a[href*="/mafuae/en/"]')
-            logger.info(f"Found {len(product_elements)} product links")
+        # Try the container selectors for Carrefour, then the direct links;
+        # parse the HTML already in hand and only query the live page when
+        # it yields no cards
+        cards = []
+        try:
+            match = extract_html_cards(page_content, PRODUCT_SELECTORS)
+            if not match['cards']:
+                match = await page.evaluate(PRODUCT_CARDS_JS, PRODUCT_SELECTORS)
+            cards = match['cards']
+            if match['selector']:
+                logger.info(f"Found {len(cards)} product containers using selector: {match['selector']}")
+            else:
+                logger.info("Falling back to direct link selection")
+                logger.info(f"Found {len(cards)} product links")
+        except Exception as e:
+            logger.warning(f"Product card extraction failed: {e}")
         
-        if not product_elements:
+        if not cards:
             logger.warning("No products found on page")
-            page_content = page.content()
-            logger.debug(f"Page title: {page.title()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Page title: %s", await page.title())
             logger.warning(f"Page URL: {page.url}")
             return products
         
-        for element in product_elements:
+        return list(self.iter_card_products(cards, base_url, country))
+    
+    def iter_card_products(self, cards: List[Dict[str, Any]], base_url: str,
+                           country: str) -> Iterator[Product]:
+        """
+        Lazily parse product cards, skipping ones that don't match.
+        
+        Args:
+            cards: Card field dictionaries read from the page
+            base_url: Base URL for constructing product URLs
+            country: Country code
+            
+        Yields:
+            Product objects, one at a time
+        """
+        for card in cards:
             try:
-                product = self._parse_product_element(element, base_url, country)
+                product = self._parse_product_element(card, base_url, country)
                 if product:
-                    products.append(product)
+                    yield product
             except Exception as e:
                 logger.warning(f"Error parsing product element: {e}")
-                continue
-        
-        return products
     
-    def _parse_product_element(self, element, base_url: str, country: str) -> Product:
+    def _parse_product_element(self, card: Dict[str, Any], base_url: str, country: str) -> Optional[Product]:
         """
-        Parse a single product element.
+        Parse a single product card read from the page.
         
         Args:
-            element: Playwright element
+            card: Fields read from one product element by READ_CARD_JS
             base_url: Base URL for constructing product URLs
             country: Country code
             
@@ -277,42 +642,23 @@ class CarrefourScraper:
             Product object or None
         """
         try:
-            # Extract product name - try to get from link text or child elements
-            product_name = None
-            
-            # First, check if element itself is a link or find link within
-            link_elem = None
-            try:
-                if element.evaluate('el => el.tagName').lower() == 'a':
-                    link_elem = element
-                else:
-                    link_elem = element.query_selector('a[href*="/mafuae/en/"], a[href*="/p/"]')
-            except Exception:
-                pass
-            
-            if link_elem:
-                try:
-                    product_name = link_elem.inner_text().strip()
-                except Exception:
-                    pass
+            # Extract product name from the link text
+            product_name = card.get('name')
             
             # Fallback to text extraction
             if not product_name or len(product_name) <5:
-                try:
-                    all_text = element.inner_text().strip()
-                    lines = [line.strip() for line in all_text.split('\n') if line.strip()]
-                    for line in lines:
-                        if len(line) > 10 and not line.replace('.', '').replace(',', '').isdigit():
-                            if any(keyword in line.lower() for keyword in ['rice', 'basmati', 'jasmine', 'sella']):
-                                product_name = line
-                                break
-                except Exception:
-                    pass
+                all_text = card.get('text') or ''
+                lines = [line.strip() for line in all_text.split('\n') if line.strip()]
+                for line in lines:
+                    if len(line) > 10 and not line.replace('.', '').replace(',', '').isdigit():
+                        if _RICE_RE.search(line):
+                            product_name = line
+                            break
             
             if not product_name or len(product_name) < 5:
                 return None
             
-            # Filter by category
+            # Filter by category before any price/URL work; cross-sell cards stop here
             category = filter_by_category(product_name, self.filters)
             if not category:
                 return None
@@ -320,65 +666,32 @@ class CarrefourScraper:
             # Extract prices - Carrefour UAE splits prices into multiple divs
             regular_price = 0.0
             
-            # Try to find price container (force-ltr class often contains prices)
-            try:
-                # Look for the price container
-                price_container = element.query_selector('[class*="force-ltr"]')
-                if not price_container:
-                    price_container = element.query_selector('[class*="items-center"][class*="ltr"]')
-                
-                if price_container:
-                    #Get all text from price container
-                    price_text = price_container.inner_text().strip()
-                    # Try to extract number from text (e.g., "28.79AED" or "28\n.79\nAED")
-                    import re
-                    # Remove spaces and newlines to make parsing easier
-                    clean_text = re.sub(r'\s+', '', price_text)
-                    # Look for patterns like "28.79" or ".79" after a number
-                    price_match = re.search(r'(\d+)\.(\d+)', clean_text)
-                    if price_match:
-                        main_part = price_match.group(1)
-                        decimal_part = price_match.group(2)
-                        regular_price = float(f"{main_part}.{decimal_part}")
-                    else:
-                        # Fallback: just get the integer part
-                        int_match = re.search(r'(\d+)', clean_text)
-                        if int_match:
-                            regular_price = float(int_match.group(1))
-            except Exception as e:
-                logger.debug(f"Price container extraction failed: {e}")
+            # Price container text (force-ltr class often contains prices)
+            price_text = card.get('price_text')
+            if price_text:
+                # Remove spaces and newlines to make parsing easier
+                clean_text = price_text.translate(_WS_TBL)
+                # Look for patterns like "28.79" or ".79" after a number,
+                # falling back to just the integer part
+                price_match = _PRICE_DEC_RE.search(clean_text) or _PRICE_INT_RE.search(clean_text)
+                if price_match:
+                    regular_price = float(price_match.group())
             
-            # Fallback: try to find separate price elements
+            # Fallback: combine separate bold/large price elements
             if regular_price == 0:
-                try:
-                    # Look for bold/large text that might be the price
-                    price_elems = element.query_selector_all('[class*="font-bold"], [class*="text-lg"], [class*="text-xl"]')
-                    price_parts = []
-                    for elem in price_elems:
-                        text = elem.inner_text().strip()
-                        if text and (text.isdigit() or '.' in text):
-                            price_parts.append(text)
-                   
-                    if price_parts:
-                        # Combine parts (e.g., ['28', '.79'] -> '28.79')
-                        price_str = ''.join(price_parts)
-                        regular_price = clean_price(price_str)
-                except Exception as e:
-                    logger.debug(f"Price parts extraction failed: {e}")
+                price_parts = [
+                    text for text in card.get('price_parts', [])
+                    if text and (text.isdigit() or '.' in text)
+                ]
+                if price_parts:
+                    # Combine parts (e.g., ['28', '.79'] -> '28.79')
+                    price_str = ''.join(price_parts)
+                    regular_price = clean_price(price_str)
             
-            # Check for promo price
-            promo_selectors = [
-                '[class*="special"]',
-                '[class*="promo"]',
-                '[class*="discount"]',
-                '[class*="sale"]'
-            ]
+            # Check for promo price, one text per promo selector in priority order
             promo_price = None
-            
-            for selector in promo_selectors:
-                promo_elem = element.query_selector(selector)
-                if promo_elem:
-                    promo_text = promo_elem.inner_text().strip()
+            for promo_text in card.get('promo_texts', []):
+                if promo_text is not None:
                     promo_price = clean_price(promo_text)
                     if promo_price > 0:
                         break
@@ -387,37 +700,16 @@ class CarrefourScraper:
             
             # Extract product URL
             product_url = base_url
-            
-            # Find the link element (might be same as element or child)
-            try:
-                if element.evaluate('el => el.tagName').lower() == 'a':
-                    href = element.get_attribute('href')
-                    if href:
-                        product_url = href if href.startswith('http') else f"{base_url}{href}"
-                else:
-                    link_elem = element.query_selector('a[href*="/mafuae/en/"], a[href*="/p/"]')
-                    if link_elem:
-                        href = link_elem.get_attribute('href')
-                        if href:
-                            product_url = href if href.startswith('http') else f"{base_url}{href}"
-            except Exception as e:
-                logger.debug(f"URL extraction failed: {e}")
+            href = card.get('href')
+            if href:
+                product_url = href if href.startswith('http') else f"{base_url}{href}"
             
             # Extract other fields
             pack_size = extract_pack_size(product_name)
             currency = 'AED' if country == 'uae' else 'SAR'
             
             # Check availability
-            availability = 'In Stock'
-            out_of_stock_indicators = [
-                '[class*="out-of-stock"]',
-                '[class*="unavailable"]',
-                'button[disabled]'
-            ]
-            for selector in out_of_stock_indicators:
-                if element.query_selector(selector):
-                    availability = 'Out of Stock'
-                    break
+            availability = 'Out of Stock' if card.get('out_of_stock') else 'In Stock'
             
             product = Product(
                 product_name=product_name,
@@ -433,9 +725,56 @@ class CarrefourScraper:
                 category=category
             )
             
-            logger.debug(f"Parsed product: {product_name}")
+            logger.debug("Parsed product: %s", product_name)
             return product
             
         except Exception as e:
             logger.warning(f"Error parsing product: {e}")
             return None
+
+
+def _logger_levels() -> Dict[str, int]:
+    """
+    Collect the levels set on this process's loggers.
+    
+    Returns:
+        Dictionary mapping logger names ('' for the root) to their levels
+    """
+    levels = {'': logging.getLogger().level}
+    for name, entry in logging.Logger.manager.loggerDict.items():
+        if isinstance(entry, logging.Logger) and entry.level != logging.NOTSET:
+            levels[name] = entry.level
+    return levels
+
+
+def _init_worker_logging(log_queue: Any, levels: Dict[str, int]):
+    """
+    Route a worker process's log records to the parent's handlers.
+    
+    Args:
+        log_queue: Queue read by the parent's QueueListener
+        levels: Logger levels from _logger_levels
+    """
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(QueueHandler(log_queue))
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def _scrape_in_process(config: dict, country: str,
+                       cdp_endpoint: Optional[str] = None) -> List[Product]:
+    """
+    Scrape one Carrefour country; runs in a ProcessPoolExecutor worker.
+    
+    Args:
+        config: Configuration dictionary
+        country: Country code
+        cdp_endpoint: Endpoint of a shared BrowserPool, if any
+        
+    Returns:
+        List of Product objects
+    """
+    scraper = CarrefourScraper(config)
+    scraper.cdp_endpoint = cdp_endpoint
+    return scraper.scrape(country)
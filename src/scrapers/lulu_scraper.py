@@ -1,15 +1,113 @@
-"""Lulu scraper using Playwright for dynamic pages."""
+"""Lulu scraper using async Playwright for dynamic pages."""
+import asyncio
 import logging
-import time
+import random
 import re
-from typing import List
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeout
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+import orjson
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeout
 from src.models import Product
-from src.utils import extract_pack_size, filter_by_category, clean_price
-
+from src.scrapers.browser_pool import block_resources, open_browser
+from src.utils import extract_pack_size, filter_by_category, clean_price, compile_category_patterns
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Taller than Carrefour's 1920x1080 on purpose: Lulu loads more of its grid as
+# rows scroll into view, so a tall, narrow window brings more rows in per
+# scroll and needs fewer scroll cycles. Cards render at 1x without motion
+# effects (see _new_context).
+VIEWPORT = {'width': 1280, 'height': 2400}
+
+# DOM predicate waited on instead of fixed sleeps
+PRODUCTS_RENDERED_JS = "document.querySelectorAll('a[href*=\"/p/\"]').length > 0"
+
+# Scrolls to the bottom until the page height is stable for two scrolls in a
+# row, waiting in the page for lazy-loaded content instead of polling over CDP
+SCROLL_PAGE_JS = '''async maxScrolls => {
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    const waitForGrowth = async (height, timeout) => {
+        const deadline = Date.now() + timeout;
+        while (document.body.scrollHeight <= height && Date.now() < deadline) {
+            await sleep(100);
+        }
+    };
+    let previous = 0;
+    let stable = 0;
+    let scrolls = 0;
+    while (scrolls < maxScrolls) {
+        scrolls++;
+        const height = document.body.scrollHeight;
+        window.scrollTo(0, height);
+        await waitForGrowth(height, 2000);
+        const current = document.body.scrollHeight;
+        if (current === previous) {
+            if (++stable >= 2) break;
+        } else {
+            stable = 0;
+        }
+        previous = current;
+    }
+    return {scrolls, height: document.body.scrollHeight};
+}'''
+
+# Upper bound on pages loading at once in the shared browser
+MAX_PARALLEL_PAGES = 3
+
+# First number in a price string, e.g. "AED 24.50"
+_PRICE_NUM_RE = re.compile(r'(\d+\.?\d*)')
+
+# Child elements that may hold the product name, tried in order
+NAME_SELECTORS = [
+    'h3', 'h4', 'h2',
+    '[class*="name"]',
+    '[class*="title"]',
+    '[class*="product"][class*="name"]',
+    '[data-testid*="name"]',
+    'span[class*="text"]'
+]
+
+# Reads every field _parse_product_element needs from all product links in
+# one round trip, keeping only the first link for each product URL. Links are
+# keyed by their resolved URL, so relative and absolute links to the same
+# product (image and title links in one card) collapse to one entry. The cards
+# come back as one JSON string, decoded in a single call on the Python side
+CARD_FIELDS_JS = r'''(links, nameSelectors) => {
+    const text = node => node ? (node.innerText || '').trim() : null;
+    const promoSelectors = ['.special-price', '.promo-price', '.discount-price', '[data-testid="promo-price"]'];
+    const seen = new Set();
+    const cards = [];
+    for (const link of links) {
+        const href = link.getAttribute('href');
+        if (!href || !href.includes('/p/') || seen.has(link.href)) continue;
+        seen.add(link.href);
+        
+        // Prices and stock badges live in the product card container around
+        // the link; walk up to it once and read all three from there
+        const container = link.closest('div[class*="rounded-"]') || link.parentElement || link;
+        const price = container.querySelector('span[data-testid="product-price"]');
+        const img = link.querySelector('img');
+        const linkText = text(link);
+        
+        cards.push({
+            href: href,
+            title: link.getAttribute('title'),
+            text: linkText,
+            alt: img ? img.getAttribute('alt') : null,
+            // Child names are only a fallback for links without text of their own
+            name_texts: linkText ? [] : nameSelectors.map(selector => text(link.querySelector(selector))),
+            price_text: price ? price.textContent.trim() : null,
+            promo_texts: promoSelectors.map(selector => text(container.querySelector(selector))),
+            out_of_stock: !!container.querySelector(
+                '.out-of-stock, .unavailable, [data-testid="out-of-stock"]'
+            ),
+        });
+    }
+    return JSON.stringify(cards);
+}'''
+
 
 class LuluScraper:
     """Scraper for Lulu using Playwright for dynamic content."""
@@ -23,7 +121,11 @@ class LuluScraper:
         """
         self.config = config
         self.retry_config = config.get('retry', {})
-        self.filters = config.get('filters', {})
+        # Category patterns compiled once, not per product
+        self.filters = compile_category_patterns(config.get('filters', {}))
+        
+        # Endpoint of a shared BrowserPool; set by the orchestrator
+        self.cdp_endpoint = None
     
     def scrape(self, country: str) -> List[Product]:
         """
@@ -35,36 +137,119 @@ class LuluScraper:
         Returns:
             List of Product objects
         """
-        logger.info(f"Starting Lulu scrape for {country.upper()}")
+        return self.scrape_countries([country])[country]
+    
+    def scrape_countries(self, countries: List[str]) -> Dict[str, List[Product]]:
+        """
+        Scrape Lulu for several countries concurrently.
+        
+        Args:
+            countries: Country codes, e.g. ['uae', 'ksa']
+            
+        Returns:
+            Dictionary mapping each country code to its Product objects
+        """
+        return asyncio.run(self.scrape_all(countries))
+    
+    async def scrape_all(self, countries: List[str]) -> Dict[str, List[Product]]:
+        """
+        Scrape Lulu for several countries concurrently.
         
-        country_config = self.config['lulu'].get(country)
-        if not country_config:
-            logger.error(f"No configuration for Lulu {country}")
-            return []
+        All countries share one browser, each in its own context and page,
+        with at most MAX_PARALLEL_PAGES loading at a time. Separate contexts
+        keep store, currency or location cookies set by one country's pages
+        from reaching another's; retries reuse the country's page, and with
+        it its cookies.
         
-        products = []
+        Args:
+            countries: Country codes, e.g. ['uae', 'ksa']
+            
+        Returns:
+            Dictionary mapping each country code to its Product objects
+        """
+        results = {}
+        country_configs = {}
+        
+        for country in countries:
+            logger.info(f"Starting Lulu scrape for {country.upper()}")
+            country_config = self.config['lulu'].get(country)
+            if not country_config:
+                logger.error(f"No configuration for Lulu {country}")
+                results[country] = []
+            else:
+                country_configs[country] = country_config
         
-        with sync_playwright() as p:
+        if country_configs:
             try:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                )
-                page = context.new_page()
-                
-                # Scrape products
-                products = self._scrape_with_page(page, country_config, country)
-                
-                browser.close()
-                logger.info(f"Total products from Lulu {country.upper()}: {len(products)}")
-                
+                async with async_playwright() as p:
+                    browser = await open_browser(p, self.cdp_endpoint)
+                    semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+                    try:
+                        scraped = await asyncio.gather(*(
+                            self._scrape_country(browser, semaphore, country_config, country)
+                            for country, country_config in country_configs.items()
+                        ))
+                    finally:
+                        await browser.close()
+                results.update(zip(country_configs, scraped))
             except Exception as e:
-                logger.error(f"Error during Lulu scraping for {country}: {e}")
+                logger.error(f"Error launching browser for Lulu: {e}")
+                for country in country_configs:
+                    results.setdefault(country, [])
         
-        return products
+        for country in countries:
+            logger.info(f"Total products from Lulu {country.upper()}: {len(results[country])}")
+        
+        return {country: results[country] for country in countries}
+    
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """
+        Create the browser context for one country's Lulu page.
+        
+        Args:
+            browser: Playwright browser
+            
+        Returns:
+            Playwright browser context
+        """
+        context = await browser.new_context(
+            viewport=VIEWPORT,
+            device_scale_factor=1,
+            has_touch=False,
+            reduced_motion='reduce',
+            user_agent=USER_AGENT
+        )
+        # Skip images, fonts and trackers; the card data is all in the DOM
+        await context.route('**/*', block_resources)
+        return context
+    
+    async def _scrape_country(self, browser: Browser, semaphore: asyncio.Semaphore,
+                              country_config: dict, country: str) -> List[Product]:
+        """
+        Scrape products in a page of a new context for this country.
+        
+        Args:
+            browser: Playwright browser
+            semaphore: Bounds the number of pages loading at once
+            country_config: Country-specific configuration
+            country: Country code
+            
+        Returns:
+            List of Product objects
+        """
+        async with semaphore:
+            try:
+                context = await self._new_context(browser)
+                try:
+                    page = await context.new_page()
+                    return await self._scrape_with_page(page, country_config, country)
+                finally:
+                    await context.close()
+            except Exception as e:
+                logger.error(f"Error during Lulu scraping for {country}: {e}")
+                return []
     
-    def _scrape_with_page(self, page: Page, country_config: dict, country: str) -> List[Product]:
+    async def _scrape_with_page(self, page: Page, country_config: dict, country: str) -> List[Product]:
         """
         Scrape products using Playwright page.
         
@@ -81,7 +266,7 @@ class LuluScraper:
         search_term = country_config['search_term']
         
         # Navigate to search page
-        full_url = f"{search_url}?search_text={search_term.replace(' ', '+')}"
+        full_url = f"{search_url}?{urlencode({'search_text': search_term})}"
         
         attempt = 0
         max_attempts = self.retry_config.get('max_attempts', 3)
@@ -91,40 +276,31 @@ class LuluScraper:
         while attempt < max_attempts:
             try:
                 logger.info(f"Navigating to: {full_url}")
-                page.goto(full_url, wait_until='domcontentloaded', timeout=30000)
+                await page.goto(full_url, wait_until='domcontentloaded', timeout=15000)
                 
-                # Wait for page to load - try multiple strategies
+                # Wait for product links to render rather than fixed delays
+                logger.info("Waiting for products to load...")
                 try:
-                    page.wait_for_load_state('load', timeout=20000)
-                    time.sleep(3)  # Additional wait for dynamic content
-                    
-                    # Wait specifically for product content to appear
-                    logger.info("Waiting for products to load...")
-                    try:
-                        # Try waiting for common product container patterns
-                        page.wait_for_selector('article, [data-testid*="product"], [class*="productCard"], [class*="product-card"], div[class*="grid"] > div', timeout=10000)
-                        time.sleep(2)  # Extra wait for all products to render
-                    except Exception as e:
-                        logger.warning(f"Timeout waiting for product selector: {e}")
-                        time.sleep(3)
-                except Exception:
-                    time.sleep(3)  # Fallback wait
+                    await page.wait_for_function(PRODUCTS_RENDERED_JS, timeout=10000)
+                except PlaywrightTimeout as e:
+                    # Normal for searches with no results
+                    logger.debug("Timeout waiting for product links: %s", e)
                 
                 # Scroll to load more products
-                self._scroll_page(page)
+                await self._scroll_page(page)
                 
-                # Optional: Save HTML for debugging
-                if logger.level <= 10:  # DEBUG level
+                # Optional: Save HTML for debugging; content() serializes the whole DOM
+                if logger.isEnabledFor(logging.DEBUG):
                     try:
-                        html_path = f"output/debug_lulu_{country}.html"
-                        with open(html_path, 'w', encoding='utf-8') as f:
-                            f.write(page.content())
-                        logger.debug(f"Saved page HTML to {html_path}")
+                        page_content = await page.content()
                     except Exception as e:
-                        logger.debug(f"Could not save HTML: {e}")
+                        logger.debug("Could not read page HTML: %s", e)
+                    else:
+                        # Write off the event loop so other countries keep loading
+                        await asyncio.to_thread(self._dump_html, country, page_content)
                 
                 # Extract products
-                products = self._extract_products(page, country_config['base_url'], country)
+                products = await self._extract_products(page, country_config['base_url'], country)
                 break
                 
             except PlaywrightTimeout as e:
@@ -132,7 +308,8 @@ class LuluScraper:
                 logger.warning(f"Attempt {attempt}/{max_attempts} timed out: {e}")
                 
                 if attempt < max_attempts:
-                    time.sleep(delay)
+                    # Jittered so parallel countries don't retry in lockstep
+                    await asyncio.sleep(delay * (1 + random.random() * 0.25))
                     delay *= backoff
                 else:
                     logger.error("Max retries reached")
@@ -144,7 +321,23 @@ class LuluScraper:
         
         return products
     
-    def _scroll_page(self, page: Page):
+    def _dump_html(self, country: str, html: str):
+        """
+        Save page HTML for debugging.
+        
+        Args:
+            country: Country code
+            html: Page HTML
+        """
+        html_path = f"output/debug_lulu_{country}.html"
+        try:
+            with open(html_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            logger.debug("Saved page HTML to %s", html_path)
+        except Exception as e:
+            logger.debug("Could not save HTML: %s", e)
+    
+    async def _scroll_page(self, page: Page):
         """
         Scroll page to trigger lazy loading and load all products.
         
@@ -153,40 +346,14 @@ class LuluScraper:
         """
         try:
             logger.info("Scrolling to load all products...")
-            previous_height = 0
-            max_scrolls = 10  # Balanced approach for loading products
-            stable_count = 0  # Count consecutive stable heights
-            
-            for scroll_num in range(max_scrolls):
-                # Get current height
-                current_height = page.evaluate('document.body.scrollHeight')
-                
-                # Scroll to bottom
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                time.sleep(1.5)  # Wait for content to load
-                
-                # Get new height
-                new_height = page.evaluate('document.body.scrollHeight')
-                
-                # If height hasn't changed, we've reached the end
-                if new_height == previous_height:
-                    stable_count += 1
-                    if stable_count >= 2:  # If stable for 2 scrolls, we're done
-                        logger.info(f"Reached end of page after {scroll_num + 1} scrolls")
-                        break
-                else:
-                    stable_count = 0
-                    
-                previous_height = new_height
-                logger.debug(f"Scroll {scroll_num + 1}: height {new_height}px")
-            
-            # Final wait for any remaining content
-            time.sleep(1)
+            # The whole loop runs in the page: one round trip instead of three per scroll
+            stats = await page.evaluate(SCROLL_PAGE_JS, 10)
+            logger.info(f"Scrolled {stats['scrolls']} times, page height {stats['height']}px")
             
         except Exception as e:
             logger.warning(f"Error scrolling page: {e}")
     
-    def _extract_products(self, page: Page, base_url: str, country: str) -> List[Product]:
+    async def _extract_products(self, page: Page, base_url: str, country: str) -> List[Product]:
         """
         Extract products from the page.
         
@@ -200,64 +367,55 @@ class LuluScraper:
         """
         products = []
         
-        # Lulu uses product card links - get the parent containers
-        product_selectors = [
-            # Try to get the full product card container that wraps the link
-            'a[href*="/p/"]',  # Product links themselves
-        ]
-        
-        product_elements = []
-        for selector in product_selectors:
-            try:
-                elements = page.query_selector_all(selector)
-                if elements:
-                    # For link elements, we want unique product links only
-                    unique_products = []
-                    seen_urls = set()
-                    
-                    for elem in elements:
-                        try:
-                            href = elem.get_attribute('href')
-                            if href and '/p/' in href:
-                                if href not in seen_urls:
-                                    seen_urls.add(href)
-                                    unique_products.append(elem)
-                        except Exception:
-                            continue
-                    
-                    if unique_products:
-                        product_elements = unique_products
-                        logger.info(f"Found {len(unique_products)} unique products using selector: {selector}")
-                        break
-            except Exception as e:
-                logger.debug(f"Selector {selector} failed: {e}")
-                continue
+        # Lulu uses product card links; read every unique one in a single call
+        selector = 'a[href*="/p/"]'
+        cards = []
+        try:
+            cards = orjson.loads(await page.eval_on_selector_all(selector, CARD_FIELDS_JS, NAME_SELECTORS))
+            if cards:
+                logger.info(f"Found {len(cards)} unique products using selector: {selector}")
+        except Exception as e:
+            logger.debug("Selector %s failed: %s", selector, e)
         
-        if not product_elements:
+        if not cards:
             logger.warning("No products found on page")
-            # Try to get all text content for debugging
-            page_content = page.content()
-            logger.debug(f"Page title: {page.title()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Page title: %s", await page.title())
             logger.warning(f"Page URL: {page.url}")
             return products
         
-        for element in product_elements:
+        # Everything below is plain Python over the returned dictionaries
+        return list(self.iter_card_products(cards, base_url, country))
+    
+    def iter_card_products(self, cards: List[Dict[str, Any]], base_url: str,
+                           country: str) -> Iterator[Product]:
+        """
+        Lazily parse product cards, skipping ones that don't match.
+        
+        Args:
+            cards: Card field dictionaries read by CARD_FIELDS_JS
+            base_url: Base URL for constructing product URLs
+            country: Country code
+            
+        Yields:
+            Product objects, one at a time
+        """
+        # Normalized once so each card only needs a plain concatenation
+        base_url = base_url.rstrip('/')
+        for card in cards:
             try:
-                product = self._parse_product_element(element, base_url, country)
+                product = self._parse_product_element(card, base_url, country)
                 if product:
-                    products.append(product)
+                    yield product
             except Exception as e:
                 logger.warning(f"Error parsing product element: {e}")
-                continue
-        
-        return products
     
-    def _parse_product_element(self, element, base_url: str, country: str) -> Product:
+    def _parse_product_element(self, card: Dict[str, Any], base_url: str, country: str) -> Optional[Product]:
         """
-        Parse a single product element.
+        Parse a single product card read from the page.
         
         Args:
-            element: Playwright element
+            card: Fields read from one product link by CARD_FIELDS_JS
             base_url: Base URL for constructing product URLs
             country: Country code
             
@@ -265,59 +423,40 @@ class LuluScraper:
             Product object or None
         """
         try:
-            # For 'a' elements (product links), get the text content
-            product_name = None
+            # Get the name from the link's title attribute or text
+            product_name = card.get('title')
             
-            try:
-                # Get text from the link element itself or look for title attribute
-                product_name = element.get_attribute('title')
+            if not product_name or len(product_name) < 5:
+                # Try inner text
+                product_name = card.get('text')
                 
-                if not product_name or len(product_name) < 5:
-                    # Try inner text
-                    product_name = element.inner_text().strip()
-                    
-                if not product_name or len(product_name) < 5:
-                    # Look in child elements
-                    name_elem = element.query_selector('img')
-                    if name_elem:
-                        alt_text = name_elem.get_attribute('alt')
-                        if alt_text and len(alt_text) > 5:
-                            product_name = alt_text
+            if not product_name or len(product_name) < 5:
+                # Look at the image alt text
+                alt_text = card.get('alt')
+                if alt_text and len(alt_text) > 5:
+                    product_name = alt_text
+            
+            if product_name:
+                # Clean up the name
+                product_name = product_name.strip()
+                # Take the first meaningful line if multi-line
+                lines = [l.strip() for l in product_name.split('\n') if l.strip()]
+                if lines:
+                    # Find the line with rice/basmati/jasmine
+                    for line in lines:
+                        if len(line) > 10 and any(kw in line.lower() for kw in ['rice', 'basmati', 'jasmine', 'sella']):
+                            product_name = line
+                            break
+                    else:
+                        product_name = lines[0] if lines else None
                 
-                if product_name:
-                    # Clean up the name
-                    product_name = product_name.strip()
-                    # Take the first meaningful line if multi-line
-                    lines = [l.strip() for l in product_name.split('\n') if l.strip()]
-                    if lines:
-                        # Find the line with rice/basmati/jasmine
-                        for line in lines:
-                            if len(line) > 10 and any(kw in line.lower() for kw in ['rice', 'basmati', 'jasmine', 'sella']):
-                                product_name = line
-                                break
-                        else:
-                            product_name = lines[0] if lines else None
-                    
-                    logger.debug(f"Extracted product name: {product_name}")
-                    
-            except Exception as e:
-                logger.debug(f"Error extracting product name: {e}")
+                logger.debug("Extracted product name: %s", product_name)
             
-            # Fallback to selectors
+            # Fallback to child elements, one text per name selector
             if not product_name:
-                name_selectors = [
-                    'h3', 'h4', 'h2',
-                    '[class*="name"]',
-                    '[class*="title"]',
-                    '[class*="product"][class*="name"]',
-                    '[data-testid*="name"]',
-                    'span[class*="text"]'
-                ]
-                
-                for selector in name_selectors:
-                    name_elem = element.query_selector(selector)
-                    if name_elem:
-                        product_name = name_elem.inner_text().strip()
+                for name_text in card.get('name_texts', []):
+                    if name_text is not None:
+                        product_name = name_text
                         if len(product_name) > 5:
                             break
             
@@ -328,78 +467,22 @@ class LuluScraper:
             # Filter by category
             category = filter_by_category(product_name, self.filters)
             if not category:
-                logger.debug(f"Product '{product_name}' did not match any category filter")
+                logger.debug("Product '%s' did not match any category filter", product_name)
                 return None
             
             # Extract prices - Lulu has prices in data-testid="product-price"
             regular_price = 0.0
-            import re
-            
-            try:
-                # Use Playwright to find the price in the product card
-                price_info = page.evaluate(r'''(linkElement) => {
-                    // Navigate up to the product card container
-                    let container = linkElement.closest('div[class*="rounded-"]') || 
-                                   linkElement.closest('div') || 
-                                   linkElement.parentElement;
-                    
-                    if (!container) return null;
-                    
-                    // Look for the price span with data-testid
-                    let priceSpan = container.querySelector('span[data-testid="product-price"]');
-                    if (priceSpan && priceSpan.textContent) {
-                        let priceText = priceSpan.textContent.trim();
-                        // Extract just the number
-                        let match = priceText.match(/(\d+\.?\d*)/);
-                        if (match && match[1]) {
-                            let price = parseFloat(match[1]);
-                            if (price > 0 && price < 10000) {
-                                return price;
-                            }
-                        }
-                    }
-                    
-                    return null;
-                }''', element)
-                
-                if price_info and price_info > 0:
-                    regular_price = float(price_info)
-                    logger.debug(f"Extracted price from product-price span: {regular_price}")
-                    
-            except Exception as e:
-                logger.debug(f"Error with price extraction: {e}")
-            
-            # Fallback: Try element.query_selector directly
-            if regular_price == 0:
-                try:
-                    # Get parent container
-                    parent = element.evaluate('el => el.closest("div[class*=\\"rounded-\\"]") || el.parentElement')
-                    if element:
-                        # Try to query selector from element's parent
-                        price_spans = element.evaluate('''el => {
-                            let container = el.closest('div[class*="rounded-"]') || el.parentElement;
-                            if (!container) return [];
-                            let spans = container.querySelectorAll('span[data-testid="product-price"]');
-                            return Array.from(spans).map(s => s.textContent.trim());
-                        }''')
-                        
-                        if price_spans and len(price_spans) > 0:
-                            price_text = price_spans[0]
-                            match = re.search(r'(\d+\.?\d*)', price_text)
-                            if match:
-                                regular_price = float(match.group(1))
-                                logger.debug(f"Extracted price from fallback: {regular_price}")
-                except Exception as e:
-                    logger.debug(f"Fallback price extraction failed: {e}")
+            price_text = card.get('price_text')
+            if price_text:
+                match = _PRICE_NUM_RE.search(price_text)
+                if match:
+                    regular_price = float(match.group(1))
+                    logger.debug("Extracted price from product-price span: %s", regular_price)
             
             # Check for promo price
-            promo_selectors = ['.special-price', '.promo-price', '.discount-price', '[data-testid="promo-price"]']
             promo_price = None
-            
-            for selector in promo_selectors:
-                promo_elem = element.query_selector(selector)
-                if promo_elem:
-                    promo_text = promo_elem.inner_text().strip()
+            for promo_text in card.get('promo_texts', []):
+                if promo_text is not None:
                     promo_price = clean_price(promo_text)
                     if promo_price > 0:
                         break
@@ -407,24 +490,17 @@ class LuluScraper:
             is_promo = promo_price is not None and promo_price < regular_price
             
             # Extract product URL
-            link_elem = element.query_selector('a')
             product_url = base_url
-            if link_elem:
-                href = link_elem.get_attribute('href')
-                if href:
-                    product_url = href if href.startswith('http') else f"{base_url}{href}"
+            href = card.get('href')
+            if href:
+                product_url = href if href[:4] == 'http' else base_url + href
             
             # Extract other fields
             pack_size = extract_pack_size(product_name)
             currency = 'AED' if country == 'uae' else 'SAR'
             
             # Check availability
-            availability = 'In Stock'
-            out_of_stock_indicators = ['.out-of-stock', '.unavailable', '[data-testid="out-of-stock"]']
-            for selector in out_of_stock_indicators:
-                if element.query_selector(selector):
-                    availability = 'Out of Stock'
-                    break
+            availability = 'Out of Stock' if card.get('out_of_stock') else 'In Stock'
             
             product = Product(
                 product_name=product_name,
@@ -440,7 +516,7 @@ class LuluScraper:
                 category=category
             )
             
-            logger.debug(f"Parsed product: {product_name}")
+            logger.debug("Parsed product: %s", product_name)
             return product
             
         except Exception as e:
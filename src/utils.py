@@ -1,37 +1,82 @@
 """Utility functions for the rice price scraper."""
 import re
 import logging
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
 logger = logging.getLogger(__name__)
 
+# Common pack size patterns: 5kg, 1kg, 500g, 5 kg, 2 x 1kg, etc.
+_PACK_SIZE_PATTERNS = (
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:kg|g|lb|lbs))', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?\s*(?:kg|g|lb|lbs))', re.IGNORECASE),
+)
 
+
+class _PriceCharTable(dict):
+    r"""
+    str.translate table keeping only decimal digits and '.'.
+    
+    Equivalent to deleting ``[^\d.]`` but without the regex engine. Entries
+    are filled in on first sight, so Unicode digits (e.g. Arabic-Indic) are
+    kept just as ``\d`` would keep them.
+    """
+    
+    def __missing__(self, code: int) -> Optional[int]:
+        value = code if code == 46 or chr(code).isdecimal() else None
+        self[code] = value
+        return value
+
+
+_PRICE_TABLE = _PriceCharTable()
+
+# Categories in priority order with their config pattern keys
+_CATEGORY_PATTERNS = (
+    ('SELLA', 'sella_pattern'),
+    ('BASMATI', 'basmati_pattern'),
+    ('JASMINE', 'jasmine_pattern'),
+)
+
+
+@lru_cache(maxsize=4096)
 def extract_pack_size(product_name: str) -> str:
     """
     Extract pack size from product name.
     
+    Results are memoized, since the same names recur across pages and runs.
+    
     Args:
         product_name: Product name string
         
     Returns:
         Pack size string (e.g., '5kg', '1kg', '500g')
     """
-    # Common patterns: 5kg, 1kg, 500g, 5 kg, 1 kg, etc.
-    patterns = [
-        r'(\d+(?:\.\d+)?\s*(?:kg|g|lb|lbs))',
-        r'(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?\s*(?:kg|g|lb|lbs))'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, product_name, re.IGNORECASE)
+    for pattern in _PACK_SIZE_PATTERNS:
+        match = pattern.search(product_name)
         if match:
             return match.group(0).strip()
     
     return "Unknown"
 
 
+def compile_category_patterns(patterns: dict) -> Dict[str, re.Pattern]:
+    """
+    Compile the category filter patterns from config once.
+    
+    Args:
+        patterns: Dictionary of regex pattern strings
+        
+    Returns:
+        Dictionary of compiled patterns for filter_by_category
+    """
+    return {
+        key: re.compile(patterns.get(key, ''), re.IGNORECASE)
+        for _, key in _CATEGORY_PATTERNS
+    }
+
+
 def filter_by_category(product_name: str, patterns: dict) -> str:
     """
     Determine product category based on regex patterns.
@@ -39,22 +84,34 @@ def filter_by_category(product_name: str, patterns: dict) -> str:
     
     Args:
         product_name: Product name to check
-        patterns: Dictionary of regex patterns
+        patterns: Dictionary of regex patterns, preferably compiled with
+            compile_category_patterns
         
     Returns:
         Category name or None if no match
     """
-    product_name_lower = product_name.lower()
+    compiled = tuple(
+        re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern
+        for pattern in (patterns.get(key, '') for _, key in _CATEGORY_PATTERNS)
+    )
+    return _category_for(product_name, compiled)
+
+
+@lru_cache(maxsize=4096)
+def _category_for(product_name: str, patterns: Tuple[re.Pattern, ...]) -> Optional[str]:
+    """
+    Memoized category match for a name against compiled patterns.
     
-    # Check for SELLA first (higher priority)
-    if re.search(patterns.get('sella_pattern', ''), product_name, re.IGNORECASE):
-        return "SELLA"
-    # Then check for BASMATI (excluding sella which was already checked)
-    elif re.search(patterns.get('basmati_pattern', ''), product_name, re.IGNORECASE):
-        return "BASMATI"
-    # Finally check for JASMINE
-    elif re.search(patterns.get('jasmine_pattern', ''), product_name, re.IGNORECASE):
-        return "JASMINE"
+    Args:
+        product_name: Product name to check
+        patterns: Compiled patterns in _CATEGORY_PATTERNS order
+        
+    Returns:
+        Category name or None if no match
+    """
+    for (category, _), pattern in zip(_CATEGORY_PATTERNS, patterns):
+        if pattern.search(product_name):
+            return category
     
     return None
 
@@ -73,7 +130,7 @@ def clean_price(price_str: str) -> float:
         return 0.0
     
     # Remove currency symbols and text
-    cleaned = re.sub(r'[^\d.]', '', str(price_str))
+    cleaned = str(price_str).translate(_PRICE_TABLE)
     
     try:
         return float(cleaned)
@@ -5,13 +5,22 @@ Business-friendly interface for scraping rice prices from multiple retailers
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import subprocess
+import logging
 import os
 import time
+import heapq
+import queue
+import threading
 from datetime import datetime
-import glob
 import sys
 
+logger = logging.getLogger(__name__)
+
 # Install Playwright browsers on first run (for Streamlit Cloud)
 @st.cache_resource
 def install_playwright():
@@ -68,31 +77,183 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Columns the Analysis tab reads; the rest of the file is never parsed there
+ANALYSIS_COLS = [
+    'product_name', 'pack_size', 'regular_price', 'promo_price',
+    'is_promo', 'retailer', 'country', 'category'
+]
+
+# Column types applied after parsing: prices stay float64 even when a column
+# is entirely empty, and low-cardinality text columns become categoricals
+RICE_DTYPES = {
+    'regular_price': 'float64',
+    'promo_price': 'float64',
+    'retailer': 'category',
+    'category': 'category',
+    'country': 'category',
+    'pack_size': 'category',
+}
+
+# Columns read as the text the scraper wrote: Arrow would otherwise parse
+# scraped_at as a timestamp, and downloads would reformat it
+CSV_COLUMN_TYPES = {'scraped_at': pa.string()}
+
+# Rows sent to the browser per page of the results table
+PAGE_SIZE = 500
+
+# Result frames kept in session state, enough for the View Results and Analysis tabs
+MAX_SESSION_FRAMES = 2
+
 def get_output_directory():
     """Get the output directory path"""
     return os.path.join(os.getcwd(), "output")
 
+@st.cache_data(ttl=5, show_spinner=False)
 def get_latest_files():
-    """Get the latest scraped files"""
+    """Get the latest 10 scraped files, newest first, as {'all': [...], 'combined': [...]}; rescans at most every 5 seconds"""
     output_dir = get_output_directory()
-    csv_files = glob.glob(os.path.join(output_dir, "rice_prices_*.csv"))
+    if not os.path.isdir(output_dir):
+        return {'all': [], 'combined': []}
+    
+    # One directory scan; mtimes come from the DirEntry instead of a stat per
+    # glob hit, and combined exports are flagged by name while we're there
+    with os.scandir(output_dir) as entries:
+        csv_files = [
+            (entry.stat().st_mtime, entry.path, 'combined' in entry.name)
+            for entry in entries
+            if entry.name.startswith("rice_prices_") and entry.name.endswith(".csv") and entry.is_file()
+        ]
     
-    if not csv_files:
-        return []
+    # Latest 10 files by modification time
+    latest = heapq.nlargest(10, csv_files)
+    return {
+        'all': [path for _, path, _ in latest],
+        'combined': [path for _, path, combined in latest if combined],
+    }
+
+@st.cache_data(show_spinner=False)
+def _read_csv(file_path, mtime, columns=None):
+    """Load a result file, from its Parquet sidecar when one is up to date; mtime is only part of the cache key"""
+    parquet_path = os.path.splitext(file_path)[0] + ".parquet"
+    try:
+        if os.path.getmtime(parquet_path) >= mtime:
+            schema = pq.read_schema(parquet_path)
+            # Sidecars that stored scraped_at as a timestamp are rebuilt
+            if 'scraped_at' not in schema.names or not pa.types.is_timestamp(schema.field('scraped_at').type):
+                if columns is not None:
+                    # Older result files may lack some of the requested columns
+                    columns = [c for c in columns if c in schema.names]
+                return pd.read_parquet(parquet_path, columns=columns)
+    except FileNotFoundError:
+        pass  # No sidecar yet; build it from the CSV
+    except (pa.ArrowException, OSError) as e:
+        # Rebuilt from the CSV below, which overwrites the bad sidecar
+        logger.warning(f"Unreadable Parquet sidecar {parquet_path}: {e}")
     
-    # Sort by modification time
-    csv_files.sort(key=os.path.getmtime, reverse=True)
-    return csv_files[:10]  # Return latest 10 files
+    # Parse the whole CSV with the multi-threaded PyArrow reader so the
+    # sidecar can serve any later column selection
+    df = pacsv.read_csv(
+        file_path, convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES)
+    ).to_pandas()
+    df = df.astype({col: dtype for col, dtype in RICE_DTYPES.items() if col in df.columns})
+    try:
+        df.to_parquet(parquet_path, compression="zstd", index=False)
+    except (pa.ArrowException, OSError) as e:
+        # Read-only output directory; the CSV is parsed again next time
+        logger.warning(f"Could not write Parquet sidecar {parquet_path}: {e}")
+    
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
 
-def load_csv_data(file_path):
-    """Load CSV data safely"""
+def load_csv_data(file_path, columns=None):
+    """Load CSV data safely, reparsing only when the file has changed"""
     try:
-        df = pd.read_csv(file_path)
+        mtime = os.path.getmtime(file_path)
+        
+        # Frames loaded earlier in this session are reused as they are, so the
+        # Analysis tab picks up the file View Results already loaded; a full
+        # frame also serves requests for a subset of its columns
+        loaded = st.session_state.setdefault('_loaded_dfs', {})
+        cached = loaded.get(file_path)
+        if cached is not None and cached[0] == mtime and cached[1] in (None, columns):
+            df = cached[2]
+            return df if columns is None else df[[c for c in columns if c in df.columns]]
+        
+        df = _read_csv(file_path, mtime, columns)
+        loaded.pop(file_path, None)
+        loaded[file_path] = (mtime, columns, df)
+        # Drop the least recently loaded files beyond the limit
+        for stale_path in list(loaded)[:-MAX_SESSION_FRAMES]:
+            del loaded[stale_path]
         return df
     except Exception as e:
         st.error(f"Error loading file: {e}")
         return None
 
+@st.cache_data(show_spinner=False)
+def _price_tables(file_path, mtime):
+    """Build the Analysis tab price tables once per file version"""
+    df = _read_csv(file_path, mtime, ANALYSIS_COLS)
+    tables = {}
+    
+    if 'regular_price' not in df.columns:
+        return tables
+    
+    # Price statistics by category
+    if 'category' in df.columns:
+        tables['category'] = df.groupby('category', observed=True)['regular_price'].agg([
+            ('Count', 'count'),
+            ('Min Price', 'min'),
+            ('Max Price', 'max'),
+            ('Avg Price', 'mean'),
+            ('Median Price', 'median')
+        ]).round(2)
+    
+    # Price statistics by retailer
+    if 'retailer' in df.columns:
+        tables['retailer'] = df.groupby('retailer', observed=True)['regular_price'].agg([
+            ('Products', 'count'),
+            ('Min Price', 'min'),
+            ('Max Price', 'max'),
+            ('Avg Price', 'mean')
+        ]).round(2)
+    
+    # Top 10 cheapest products
+    tables['cheapest'] = df.nsmallest(10, 'regular_price')[
+        ['product_name', 'pack_size', 'regular_price', 'retailer', 'country']
+    ]
+    
+    return tables
+
+@st.cache_data(show_spinner=False)
+def _read_bytes(file_path, mtime):
+    """Read a file for download; mtime is only part of the cache key"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+def filter_options(series, filtered=True):
+    """Selectbox options for a categorical column: 'All' then its values in sorted order"""
+    categories = series.cat.categories
+    if not filtered:
+        # Categories were built from this very frame, so all are present
+        return ('All', *categories)
+    
+    # Only keep categories still present, found from the integer codes
+    codes = np.unique(series.cat.codes.to_numpy())
+    return ('All', *categories[codes[codes >= 0]])
+
+def filter_results(df, category='All', retailer='All', pack_size='All'):
+    """Apply the View Results filters; 'All' leaves a column unfiltered"""
+    for col, value in (('category', category), ('retailer', retailer), ('pack_size', pack_size)):
+        if value != 'All' and col in df.columns:
+            df = df[df[col] == value]
+    return df
+
+@st.cache_data(show_spinner=False)
+def _filtered_csv(file_path, mtime, category, retailer, pack_size):
+    """Encode a filtered result file for download, once per file version and filter combination"""
+    df = filter_results(_read_csv(file_path, mtime), category, retailer, pack_size)
+    return df.to_csv(index=False).encode('utf-8')
+
 def run_scraper(retailer=None, country=None):
     """Run the scraper with optional filters"""
     try:
@@ -103,12 +264,14 @@ def run_scraper(retailer=None, country=None):
         if country:
             cmd.extend(["-n", country])
         
-        # Run the scraper
+        # Run the scraper; line-buffered and unbuffered so output arrives as it is logged
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True
+            text=True,
+            bufsize=1,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"}
         )
         
         return process
@@ -116,6 +279,17 @@ def run_scraper(retailer=None, country=None):
         st.error(f"Error starting scraper: {e}")
         return None
 
+def pump_lines(stream, sink):
+    """Pass each line of a pipe to sink on a background thread, then None at EOF"""
+    def pump():
+        for line in stream:
+            sink(line)
+        sink(None)
+    
+    thread = threading.Thread(target=pump, daemon=True)
+    thread.start()
+    return thread
+
 def display_metrics(df):
     """Display key metrics from the data"""
     if df is None or df.empty:
@@ -123,22 +297,35 @@ def display_metrics(df):
     
     col1, col2, col3, col4 = st.columns(4)
     
+    # Both distinct counts in one call; cheap on the categorical columns from the loader
+    counts = df[[c for c in ('retailer', 'category') if c in df.columns]].nunique()
+    
     with col1:
         st.metric("Total Products", len(df))
     
     with col2:
-        if 'retailer' in df.columns:
-            st.metric("Retailers", df['retailer'].nunique())
+        if 'retailer' in counts:
+            st.metric("Retailers", int(counts['retailer']))
     
     with col3:
-        if 'category' in df.columns:
-            st.metric("Categories", df['category'].nunique())
+        if 'category' in counts:
+            st.metric("Categories", int(counts['category']))
     
     with col4:
         if 'regular_price' in df.columns:
             avg_price = df['regular_price'].mean()
             st.metric("Avg Price", f"{avg_price:.2f}")
 
+@st.cache_data(ttl=120, show_spinner=False)
+def _footer(minute_bucket):
+    """Footer HTML, rendered once per minute so reruns send an identical string"""
+    return """
+    <div style='text-align: center; color: #666;'>
+        <p>Rice Price Scraper v1.0 | Last updated: {}</p>
+        <p>Powered by Playwright & Streamlit</p>
+    </div>
+    """.format(datetime.fromtimestamp(minute_bucket * 60).strftime("%Y-%m-%d %H:%M"))
+
 def main():
     # Header
     st.markdown('<div class="main-header">🌾 Rice Price Scraper</div>', unsafe_allow_html=True)
@@ -173,6 +360,9 @@ def main():
     )
     selected_country = country_options[selected_country_label]
     
+    # Balloon animation on success; off unless asked for
+    st.sidebar.checkbox("🎈 Celebrate finished runs", key="enable_celebrations")
+    
     st.sidebar.markdown("---")
     
     # Run button
@@ -196,31 +386,67 @@ def main():
             if process:
                 output_lines = []
                 
+                # Both pipes are drained off the main thread; stderr carries the
+                # log and would otherwise fill up and stall the scraper
+                stdout_queue = queue.Queue()
+                stderr_lines = []
+                pump_lines(process.stdout, stdout_queue.put)
+                stderr_thread = pump_lines(process.stderr, stderr_lines.append)
+                
+                # UI updates are coalesced: the latest status is sent at most
+                # every 200 ms, and the progress bar only when its percent changes
+                pending_status = None
+                last_ui = time.monotonic()
+                last_pct = 0
+                
                 # Read output in real-time
-                for line in process.stdout:
-                    output_lines.append(line.strip())
+                while True:
+                    try:
+                        line = stdout_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        line = ""
+                    if line is None:
+                        break
                     
-                    # Update status based on log output
-                    if "Scraping" in line:
-                        status_text.text(f"🔄 {line.strip()}")
-                    elif "Total products" in line:
-                        status_text.text(f"✅ {line.strip()}")
-                    elif "Successfully scraped" in line:
-                        status_text.text(f"🎉 {line.strip()}")
+                    if line:
+                        output_lines.append(line.strip())
+                        
+                        # Update status based on log output
+                        if "Scraping" in line:
+                            pending_status = f"🔄 {line.strip()}"
+                        elif "Total products" in line:
+                            pending_status = f"✅ {line.strip()}"
+                        elif "Successfully scraped" in line:
+                            pending_status = f"🎉 {line.strip()}"
+                        
+                        # Update progress (simple estimation)
+                        if len(output_lines) % 5 == 0:
+                            progress = min(len(output_lines) * 2, 100)
+                            if progress != last_pct:
+                                progress_bar.progress(progress / 100)
+                                last_pct = progress
                     
-                    # Update progress (simple estimation)
-                    if len(output_lines) % 5 == 0:
-                        progress = min(len(output_lines) * 2, 100)
-                        progress_bar.progress(progress / 100)
+                    if pending_status and time.monotonic() - last_ui > 0.2:
+                        status_text.text(pending_status)
+                        pending_status = None
+                        last_ui = time.monotonic()
+                
+                if pending_status:
+                    status_text.text(pending_status)
                 
                 # Wait for process to complete
                 process.wait()
+                stderr_thread.join()
+                
+                # New result files; don't wait for the listing to expire
+                get_latest_files.clear()
                 
                 progress_bar.progress(100)
                 
                 if process.returncode == 0:
                     st.markdown('<div class="success-message">🎉 Scraping completed successfully!</div>', unsafe_allow_html=True)
-                    st.balloons()
+                    if st.session_state.get('enable_celebrations', False):
+                        st.balloons()
                     
                     # Show output log
                     with st.expander("View Detailed Log"):
@@ -228,7 +454,7 @@ def main():
                 else:
                     st.markdown('<div class="error-message">❌ Scraping encountered errors. Check the log below.</div>', unsafe_allow_html=True)
                     with st.expander("View Error Log"):
-                        error_output = process.stderr.read()
+                        error_output = "".join(line for line in stderr_lines if line is not None)
                         st.code(error_output)
         else:
             st.info("👈 Configure settings in the sidebar and click 'Run Scraper' to start")
@@ -259,7 +485,7 @@ def main():
     with tab2:
         st.markdown("### 📁 Recent Scraping Results")
         
-        latest_files = get_latest_files()
+        latest_files = get_latest_files()['all']
         
         if not latest_files:
             st.warning("No results found. Run the scraper first to generate data.")
@@ -280,36 +506,47 @@ def main():
                     
                     # Filters
                     col1, col2, col3 = st.columns(3)
+                    selected_category = selected_retailer_filter = selected_pack = 'All'
                     
                     with col1:
                         if 'category' in df.columns:
-                            categories = ['All'] + list(df['category'].unique())
+                            categories = filter_options(df['category'], filtered=False)
                             selected_category = st.selectbox("Filter by Category", categories)
-                            if selected_category != 'All':
-                                df = df[df['category'] == selected_category]
+                            df = filter_results(df, category=selected_category)
                     
                     with col2:
                         if 'retailer' in df.columns:
-                            retailers = ['All'] + list(df['retailer'].unique())
+                            retailers = filter_options(df['retailer'], filtered=selected_category != 'All')
                             selected_retailer_filter = st.selectbox("Filter by Retailer", retailers)
-                            if selected_retailer_filter != 'All':
-                                df = df[df['retailer'] == selected_retailer_filter]
+                            df = filter_results(df, retailer=selected_retailer_filter)
                     
                     with col3:
                         if 'pack_size' in df.columns:
-                            pack_sizes = ['All'] + sorted(df['pack_size'].unique())
+                            pack_sizes = filter_options(
+                                df['pack_size'],
+                                filtered=(selected_category, selected_retailer_filter) != ('All', 'All')
+                            )
                             selected_pack = st.selectbox("Filter by Pack Size", pack_sizes)
-                            if selected_pack != 'All':
-                                df = df[df['pack_size'] == selected_pack]
+                            df = filter_results(df, pack_size=selected_pack)
                     
-                    # Display data
-                    st.dataframe(df, use_container_width=True, height=400)
+                    # Display data, one page at a time so only PAGE_SIZE rows are sent
+                    total_rows = len(df)
+                    max_pages = max(1, -(-total_rows // PAGE_SIZE))
+                    page = 1
+                    if max_pages > 1:
+                        page = int(st.number_input("Page", min_value=1, max_value=max_pages, value=1, step=1))
+                    start = (page - 1) * PAGE_SIZE
+                    st.dataframe(df.iloc[start:start + PAGE_SIZE], use_container_width=True, height=400)
+                    st.caption(f"{total_rows} rows" + (f" | page {page} of {max_pages}" if max_pages > 1 else ""))
                     
                     # Download buttons
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        csv = df.to_csv(index=False).encode('utf-8')
+                        csv = _filtered_csv(
+                            file_path, os.path.getmtime(file_path),
+                            selected_category, selected_retailer_filter, selected_pack
+                        )
                         st.download_button(
                             label="📥 Download CSV",
                             data=csv,
@@ -321,12 +558,15 @@ def main():
                     with col2:
                         # Excel download
                         excel_path = file_path.replace('.csv', '.xlsx')
-                        if os.path.exists(excel_path):
-                            with open(excel_path, 'rb') as f:
-                                excel_data = f.read()
+                        # One stat answers both "does it exist" and "has it changed"
+                        try:
+                            excel_mtime = os.stat(excel_path).st_mtime
+                        except OSError:
+                            excel_mtime = None
+                        if excel_mtime is not None:
                             st.download_button(
                                 label="📥 Download Excel",
-                                data=excel_data,
+                                data=_read_bytes(excel_path, excel_mtime),
                                 file_name=f"filtered_{os.path.basename(excel_path)}",
                                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                 use_container_width=True
@@ -336,79 +576,55 @@ def main():
     with tab3:
         st.markdown("### 📈 Price Analysis")
         
-        latest_files = get_latest_files()
+        listing = get_latest_files()
         
-        if not latest_files:
+        if not listing['all']:
             st.warning("No data available for analysis. Run the scraper first.")
         else:
             # Load the latest combined file or first file
-            combined_files = [f for f in latest_files if 'combined' in f]
-            file_to_analyze = combined_files[0] if combined_files else latest_files[0]
+            file_to_analyze = listing['combined'][0] if listing['combined'] else listing['all'][0]
             
-            df = load_csv_data(file_to_analyze)
+            df = load_csv_data(file_to_analyze, ANALYSIS_COLS)
             
             if df is not None and not df.empty:
                 st.write(f"Analyzing: {os.path.basename(file_to_analyze)}")
                 
+                # Aggregates are cached per file; widget reruns only redraw them
+                tables = _price_tables(file_to_analyze, os.path.getmtime(file_to_analyze))
+                
                 # Price statistics by category
-                if 'category' in df.columns and 'regular_price' in df.columns:
+                if 'category' in tables:
                     st.markdown("#### Price Statistics by Category")
-                    
-                    price_stats = df.groupby('category')['regular_price'].agg([
-                        ('Count', 'count'),
-                        ('Min Price', 'min'),
-                        ('Max Price', 'max'),
-                        ('Avg Price', 'mean'),
-                        ('Median Price', 'median')
-                    ]).round(2)
-                    
-                    st.dataframe(price_stats, use_container_width=True)
+                    st.dataframe(tables['category'], use_container_width=True)
                 
                 # Price statistics by retailer
-                if 'retailer' in df.columns and 'regular_price' in df.columns:
+                if 'retailer' in tables:
                     st.markdown("#### Price Statistics by Retailer")
-                    
-                    retailer_stats = df.groupby('retailer')['regular_price'].agg([
-                        ('Products', 'count'),
-                        ('Min Price', 'min'),
-                        ('Max Price', 'max'),
-                        ('Avg Price', 'mean')
-                    ]).round(2)
-                    
-                    st.dataframe(retailer_stats, use_container_width=True)
+                    st.dataframe(tables['retailer'], use_container_width=True)
                 
                 # Top 10 cheapest products
-                if 'regular_price' in df.columns:
+                if 'cheapest' in tables:
                     st.markdown("#### Top 10 Cheapest Products")
-                    
-                    cheapest = df.nsmallest(10, 'regular_price')[
-                        ['product_name', 'pack_size', 'regular_price', 'retailer', 'country']
-                    ]
-                    
-                    st.dataframe(cheapest, use_container_width=True)
+                    st.dataframe(tables['cheapest'], use_container_width=True)
                 
                 # Products with promotions
                 if 'is_promo' in df.columns:
-                    promo_count = df['is_promo'].sum()
+                    # One mask serves both the count and the slice
+                    promo_mask = df['is_promo'].eq(True).to_numpy()
+                    promo_count = int(promo_mask.sum())
                     if promo_count > 0:
                         st.markdown(f"#### Products with Promotions ({promo_count})")
                         
-                        promo_df = df[df['is_promo'] == True][
+                        promo_df = df.loc[
+                            promo_mask,
                             ['product_name', 'pack_size', 'regular_price', 'promo_price', 'retailer']
-                        ]
-                        
-                        if not promo_df.empty:
-                            promo_df['Savings'] = promo_df['regular_price'] - promo_df['promo_price']
-                            st.dataframe(promo_df, use_container_width=True)
+                        ].copy()
+                        promo_df['Savings'] = promo_df['regular_price'].sub(promo_df['promo_price'])
+                        st.dataframe(promo_df, use_container_width=True)
 
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666;'>
-        <p>Rice Price Scraper v1.0 | Last updated: {}</p>
-        <p>Powered by Playwright & Streamlit</p>
-    </div>
-    """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")), unsafe_allow_html=True)
+    st.markdown(_footer(int(time.time() // 60)), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
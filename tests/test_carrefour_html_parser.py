@@ -0,0 +1,68 @@
+"""Tests for reading Carrefour product cards from fetched HTML."""
+import unittest
+
+from src.scrapers.carrefour_html_parser import extract_html_cards
+from src.scrapers.carrefour_scraper import CarrefourScraper
+
+
+# Six identical cards so the container selector wins the probe
+CARD_HTML = (
+    '<div class="product-card">'
+    '<a href="/mafuae/en/rice/india-gate-basmati/p/123">'
+    '<span>India Gate</span> <span>Basmati Rice 5kg</span>'
+    '</a>'
+    '<div class="force-ltr">28<span>.79</span> AED</div>'
+    '</div>'
+)
+PAGE_HTML = '<html><body>%s</body></html>' % (CARD_HTML * 6)
+
+# What page.evaluate(READ_CARD_JS) returns for CARD_HTML in Chromium
+READ_CARD_JS_OUTPUT = {
+    'name': 'India Gate Basmati Rice 5kg',
+    'text': None,
+    'href': '/mafuae/en/rice/india-gate-basmati/p/123',
+    'price_text': '28.79 AED',
+    'price_parts': [],
+    'promo_texts': [None, None, None, None],
+    'out_of_stock': False,
+}
+
+CONFIG = {
+    'filters': {
+        'sella_pattern': '(?i)sella',
+        'basmati_pattern': '(?i)basmati',
+        'jasmine_pattern': '(?i)jasmine',
+    },
+}
+
+
+class MultiSpanLinkTest(unittest.TestCase):
+    """A link whose name is split over several inline spans."""
+    
+    def setUp(self):
+        match = extract_html_cards(PAGE_HTML, ['div.product-card'])
+        self.assertEqual(match['selector'], 'div.product-card')
+        self.card = match['cards'][0]
+    
+    def test_card_matches_read_card_js(self):
+        expected = dict(READ_CARD_JS_OUTPUT)
+        # Text runs are space-joined, so only whitespace may differ in the
+        # price text; the parser strips it before reading the number
+        self.assertEqual(self.card.pop('price_text').replace(' ', ''),
+                         expected.pop('price_text').replace(' ', ''))
+        self.assertEqual(self.card, expected)
+    
+    def test_product_matches_browser_path(self):
+        scraper = CarrefourScraper(CONFIG)
+        base_url = 'https://www.carrefouruae.com'
+        from_html = scraper._parse_product_element(self.card, base_url, 'uae')
+        from_browser = scraper._parse_product_element(READ_CARD_JS_OUTPUT, base_url, 'uae')
+        
+        self.assertEqual(from_html.product_name, 'India Gate Basmati Rice 5kg')
+        for field in ('product_name', 'pack_size', 'regular_price', 'promo_price',
+                      'category', 'availability', 'product_url'):
+            self.assertEqual(getattr(from_html, field), getattr(from_browser, field), field)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for reading Carrefour products from JSON embedded in the page."""
+import json
+import unittest
+
+from src.scrapers.carrefour_json_parser import extract_json_products
+from src.utils import compile_category_patterns
+
+
+FILTERS = compile_category_patterns({
+    'sella_pattern': '(?i)sella',
+    'basmati_pattern': '(?i)basmati',
+    'jasmine_pattern': '(?i)jasmine',
+})
+BASE_URL = 'https://www.carrefouruae.com'
+
+PRODUCT = {
+    'name': 'India Gate Basmati Rice 5kg',
+    'size': '5kg',
+    'price': {'price': 28.79, 'currency': 'AED'},
+    'availability': {'isAvailable': True},
+    'stock': {'stockLevelStatus': 'inStock'},
+    'links': {'productUrl': {'href': '/mafuae/en/p/123'}},
+}
+
+
+def _push(payload) -> str:
+    # Compact separators, as the page serializes them
+    return '<script>window.dataLayer.push(%s);</script>' % json.dumps([payload], separators=(',', ':'))
+
+
+def _page(*scripts: str) -> str:
+    return '<html><body>%s</body></html>' % ''.join(scripts)
+
+
+class ExtractJsonProductsTest(unittest.TestCase):
+    """Products are found in whichever dataLayer push call carries them."""
+    
+    def _names(self, page: str):
+        return [p.product_name for p in extract_json_products(page, BASE_URL, 'uae', FILTERS)]
+    
+    def test_products_in_first_push(self):
+        page = _page(_push({'event': 'search', 'ecommerce': {'products': [PRODUCT]}}))
+        self.assertEqual(self._names(page), ['India Gate Basmati Rice 5kg'])
+    
+    def test_products_in_later_push(self):
+        page = _page(
+            _push({'event': 'pageview', 'page': 'search'}),
+            _push({'event': 'search', 'ecommerce': {'products': [PRODUCT]}}),
+        )
+        self.assertEqual(self._names(page), ['India Gate Basmati Rice 5kg'])
+    
+    def test_string_containing_call_end(self):
+        page = _page(_push({
+            'event': 'search',
+            'searchTerm': 'rice");',
+            'ecommerce': {'products': [PRODUCT]},
+        }))
+        self.assertEqual(self._names(page), ['India Gate Basmati Rice 5kg'])
+    
+    def test_products_key_outside_push_ignored(self):
+        page = _page(
+            _push({'event': 'pageview'}),
+            '<script>var recs = {"products":[%s]};</script>' % json.dumps(PRODUCT, separators=(',', ':')),
+        )
+        self.assertEqual(self._names(page), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
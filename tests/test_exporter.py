@@ -0,0 +1,53 @@
+"""Tests for the CSV and Excel exporter."""
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src.exporter import DataExporter
+from src.models import Product
+
+
+def _product(**overrides) -> Product:
+    values = dict(
+        product_name='India Gate Basmati Rice, "Classic"',
+        pack_size='5kg',
+        currency='AED',
+        regular_price=28.0,
+        promo_price=None,
+        is_promo=False,
+        availability='In Stock',
+        product_url='https://example.com/p/123',
+        retailer='Carrefour',
+        country='UAE',
+        category='Basmati',
+        scraped_at=datetime(2026, 1, 2, 3, 4, 5, 678901),
+    )
+    values.update(overrides)
+    return Product(**values)
+
+
+PRODUCTS = [
+    _product(),
+    _product(product_name='Tilda Rice 2kg', regular_price=19.95, promo_price=15.5,
+             is_promo=True, retailer='Lulu', country='KSA', currency='SAR'),
+]
+
+
+class CombinedCsvTest(unittest.TestCase):
+    """The combined CSV must not depend on whether Excel export is enabled."""
+
+    def _export(self, output_dir: str, excel_enabled: bool) -> str:
+        exporter = DataExporter({'output_dir': output_dir, 'excel_enabled': excel_enabled})
+        exporter.export_combined(PRODUCTS, filename='combined')
+        with open(os.path.join(output_dir, 'combined.csv'), encoding='utf-8') as f:
+            return f.read()
+
+    def test_dataframe_and_streamed_csv_match(self):
+        with tempfile.TemporaryDirectory() as with_excel, \
+                tempfile.TemporaryDirectory() as csv_only:
+            self.assertEqual(self._export(with_excel, True), self._export(csv_only, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Tests for the scraper utility functions."""
+import unittest
+
+from src.utils import compile_category_patterns, filter_by_category
+
+
+class FilterByCategoryTest(unittest.TestCase):
+    """Categories follow the SELLA > BASMATI > JASMINE priority."""
+    
+    def setUp(self):
+        self.patterns = compile_category_patterns({
+            'sella_pattern': '(?i)sella',
+            'basmati_pattern': '(?i)basmati',
+            'jasmine_pattern': '(?i)jasmine',
+        })
+    
+    def test_priority_ignores_position_in_name(self):
+        self.assertEqual(filter_by_category('Basmati Rice Sella 5kg', self.patterns), 'SELLA')
+        self.assertEqual(filter_by_category('Jasmine or Basmati', self.patterns), 'BASMATI')
+        self.assertEqual(filter_by_category('Thai Jasmine Rice', self.patterns), 'JASMINE')
+        self.assertIsNone(filter_by_category('Brown Rice 2kg', self.patterns))
+    
+    def test_pattern_with_backreference(self):
+        patterns = compile_category_patterns({
+            'sella_pattern': r'(?i)\b(x)\1\b',
+            'basmati_pattern': r'(?i)(basmati)\s+\1',
+            'jasmine_pattern': '(?i)jasmine',
+        })
+        self.assertEqual(filter_by_category('Basmati basmati 5kg', patterns), 'BASMATI')
+        self.assertEqual(filter_by_category('XX Basmati basmati', patterns), 'SELLA')
+
+
+if __name__ == '__main__':
+    unittest.main()